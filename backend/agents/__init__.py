@@ -1,26 +1,29 @@
-# agents/__init__.py
-from .content_generator import ContentGeneratorAgent
-from .path_generator import PathGeneratorAgent
-from .evaluator import EvaluatorAgent
-from .orchestrator import AgentOrchestrator
-from .learning_content_generator import LearningContentGenerator
-from .models import (
-    LearnerProfile, 
-    LearningResource, 
-    LearningPath, 
-    QuizQuestion,
-    LearningContent
-)
-
-__all__ = [
-    'ContentGeneratorAgent',
-    'PathGeneratorAgent', 
-    'EvaluatorAgent',
-    'AgentOrchestrator',
-    'LearningContentGenerator',
-    'LearnerProfile',
-    'LearningResource', 
-    'LearningPath',
-    'QuizQuestion',
-    'LearningContent'
+# agents/__init__.py
+from .content_generator import ContentGeneratorAgent, run_async
+from .path_generator import PathGeneratorAgent
+from .evaluator import EvaluatorAgent
+from .orchestrator import AgentOrchestrator
+from .learning_content_generator import LearningContentGenerator
+from .models import (
+    LearnerProfile, 
+    LearningResource, 
+    LearningPath, 
+    QuizQuestion,
+    LearningContent,
+    shallow_asdict
+)
+
+__all__ = [
+    'ContentGeneratorAgent',
+    'PathGeneratorAgent', 
+    'EvaluatorAgent',
+    'AgentOrchestrator',
+    'LearningContentGenerator',
+    'LearnerProfile',
+    'LearningResource', 
+    'LearningPath',
+    'QuizQuestion',
+    'LearningContent',
+    'shallow_asdict',
+    'run_async'
 ]
\ No newline at end of file
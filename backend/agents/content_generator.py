@@ -1,342 +1,672 @@
-# agents/content_generator.py
-import json
-import uuid
-import time
-import re
-from typing import List, Dict
-from dataclasses import dataclass
-import requests
-from .models import QuizQuestion
-
-class GeminiClient:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.base_url = 'https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent'
-        
-    def generate(self, prompt: str, max_tokens: int = 2048) -> str:
-        """Generate text using Gemini AI API"""
-        try:
-            url = f"{self.base_url}?key={self.api_key}"
-            
-            payload = {
-                "contents": [
-                    {
-                        "parts": [
-                            {
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "maxOutputTokens": max_tokens,
-                    "topP": 0.8,
-                    "topK": 40
-                }
-            }
-            
-            print(f"🤖 Sending request to Gemini AI...")
-            response = requests.post(
-                url, 
-                json=payload, 
-                headers={'Content-Type': 'application/json'},
-                verify=False
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            if 'candidates' in result and len(result['candidates']) > 0:
-                if 'content' in result['candidates'][0]:
-                    if 'parts' in result['candidates'][0]['content']:
-                        return result['candidates'][0]['content']['parts'][0]['text']
-            
-            print(f"❌ Unexpected Gemini response format: {result}")
-            return ""
-            
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Gemini request error: {e}")
-            raise Exception(f"Failed to connect to Gemini AI: {e}")
-        except Exception as e:
-            print(f"❌ Gemini error: {e}")
-            raise Exception(f"Gemini generation failed: {e}")
-
-class ContentGeneratorAgent:
-    """AI Agent for generating educational content using Gemini AI"""
-    
-    def __init__(self, gemini_api_key: str):
-        self.gemini = GeminiClient(gemini_api_key)
-        self.agent_name = "ContentGenerator"
-        self.system_context = """You are an expert educational content generator. 
-        Your role is to create high-quality learning materials, quizzes, and analyze learning patterns."""
-        
-    def generate_quiz_questions(self, topic: str, difficulty: int, count: int = 5) -> List[QuizQuestion]:
-        """Generate quiz questions using Gemini AI"""
-        
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            try:
-                print(f"🤖 Generating {count} questions for topic: {topic}, difficulty: {difficulty}/5 (attempt {retry_count + 1})")
-                
-                prompt = f"""{self.system_context}
-
-TASK: Create exactly {count} multiple choice questions about {topic} at difficulty level {difficulty} out of 5.
-
-REQUIREMENTS:
-- Each question must have exactly 4 options
-- Difficulty level {difficulty}/5 where 1=beginner, 5=expert
-- Focus specifically on {topic}
-- Return ONLY valid JSON format
-- Make questions educational and accurate
-- Ensure one correct answer per question
-
-FORMAT (return exactly this structure):
-[
-  {{
-    "question": "What is the main concept of {topic}?",
-    "options": ["Correct Answer", "Wrong Option 1", "Wrong Option 2", "Wrong Option 3"],
-    "correct_answer": "Correct Answer",
-    "topic": "{topic}"
-  }}
-]
-
-Create {count} questions about {topic} now. Return only the JSON array without any additional text or formatting:"""
-                
-                response_text = self.gemini.generate(prompt, max_tokens=2048)
-                
-                if not response_text:
-                    raise Exception("Empty response from Gemini AI")
-                
-                print(f"📥 Raw Gemini response: {response_text[:300]}...")
-                
-                # Clean the response
-                response_text = self._clean_json_response(response_text)
-                
-                # Parse JSON
-                questions_data = json.loads(response_text)
-                
-                if not isinstance(questions_data, list):
-                    raise ValueError("Response is not a JSON array")
-                
-                # Take only the requested number of questions
-                questions_data = questions_data[:count]
-                
-                questions = []
-                for i, q_data in enumerate(questions_data):
-                    # Validate question structure
-                    required_fields = ['question', 'options', 'correct_answer']
-                    if not all(field in q_data for field in required_fields):
-                        print(f"⚠️ Question {i+1} missing fields, skipping")
-                        continue
-                    
-                    if not isinstance(q_data['options'], list) or len(q_data['options']) < 4:
-                        print(f"⚠️ Question {i+1} invalid options, skipping")
-                        continue
-                    
-                    # Ensure we have exactly 4 options
-                    options = q_data['options'][:4]
-                    
-                    # Make sure correct answer is in options
-                    correct_answer = q_data['correct_answer']
-                    if correct_answer not in options:
-                        # Use the first option as correct answer
-                        correct_answer = options[0]
-                    
-                    question = QuizQuestion(
-                        id=str(uuid.uuid4()),
-                        question=q_data['question'],
-                        options=options,
-                        correct_answer=correct_answer,
-                        topic=q_data.get('topic', topic),
-                        difficulty_level=difficulty,
-                        resource_id=""
-                    )
-                    questions.append(question)
-                
-                if len(questions) >= count:
-                    questions = questions[:count]
-                    print(f"✅ Successfully generated {len(questions)} questions")
-                    return questions
-                else:
-                    raise ValueError(f"Generated only {len(questions)} valid questions, need {count}")
-                
-            except json.JSONDecodeError as e:
-                print(f"❌ JSON parsing error (attempt {retry_count + 1}): {e}")
-                print(f"Response text: {response_text}")
-                retry_count += 1
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"❌ Error generating questions (attempt {retry_count + 1}): {e}")
-                retry_count += 1
-                time.sleep(2)
-        
-        # If all retries failed, generate simple questions
-        print("⚠️ Gemini AI failed, generating basic questions")
-        return self._generate_basic_questions(topic, difficulty, count)
-    
-    def _clean_json_response(self, response_text: str) -> str:
-        """Clean the Gemini response to extract valid JSON"""
-        
-        # Remove markdown code blocks if present
-        response_text = re.sub(r'```json\s*', '', response_text)
-        response_text = re.sub(r'```\s*', '', response_text)
-        
-        # Find JSON array boundaries
-        start_idx = response_text.find('[')
-        end_idx = response_text.rfind(']')
-        
-        if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-            json_content = response_text[start_idx:end_idx + 1]
-        else:
-            # Try to find individual objects and wrap in array
-            objects = []
-            lines = response_text.split('\n')
-            current_object = ""
-            brace_count = 0
-            
-            for line in lines:
-                if '{' in line:
-                    current_object = line
-                    brace_count = line.count('{') - line.count('}')
-                elif current_object and brace_count > 0:
-                    current_object += " " + line
-                    brace_count += line.count('{') - line.count('}')
-                    
-                    if brace_count == 0:
-                        try:
-                            obj = json.loads(current_object)
-                            objects.append(obj)
-                            current_object = ""
-                        except:
-                            current_object = ""
-                            brace_count = 0
-            
-            if objects:
-                json_content = json.dumps(objects)
-            else:
-                json_content = response_text
-        
-        return json_content
-    
-    def _generate_basic_questions(self, topic: str, difficulty: int, count: int) -> List[QuizQuestion]:
-        """Generate basic questions when Gemini AI fails"""
-        questions = []
-        
-        question_templates = {
-            'algebra': [
-                ("What is a variable in algebra?", ["A letter representing an unknown", "A constant number", "An operation", "A graph"]),
-                ("How do you solve x + 5 = 10?", ["Subtract 5 from both sides", "Add 5 to both sides", "Multiply by 5", "Divide by 5"]),
-                ("What is a linear equation?", ["An equation with degree 1", "An equation with degree 2", "A curved line", "A circle"]),
-                ("What does 'like terms' mean?", ["Terms with same variables and powers", "Any two numbers", "Equal signs", "Multiplication terms"]),
-                ("What is the order of operations?", ["PEMDAS/BODMAS", "Left to right always", "Addition first", "Random order"]),
-            ],
-            'calculus': [
-                ("What is a limit?", ["Value a function approaches", "Maximum value", "Minimum value", "Average value"]),
-                ("What is a derivative?", ["Rate of change", "Area under curve", "Maximum point", "Minimum point"]),
-                ("What is integration?", ["Finding area under curve", "Finding slope", "Finding maximum", "Finding minimum"]),
-                ("What does continuity mean?", ["No breaks in function", "Always increasing", "Always positive", "Has a maximum"]),
-                ("What is the fundamental theorem?", ["Links derivatives and integrals", "States all functions continuous", "Proves limits exist", "Shows functions are smooth"]),
-            ],
-            'geometry': [
-                ("Sum of angles in a triangle?", ["180 degrees", "360 degrees", "90 degrees", "270 degrees"]),
-                ("Area of a rectangle?", ["length × width", "2(length + width)", "length + width", "length²"]),
-                ("What is a right angle?", ["90 degrees", "180 degrees", "45 degrees", "60 degrees"]),
-                ("What is the Pythagorean theorem?", ["a² + b² = c²", "a + b = c", "a × b = c", "a² = b² + c²"]),
-                ("How many sides does a hexagon have?", ["6", "5", "7", "8"]),
-            ],
-            'trigonometry': [
-                ("What is sine in a right triangle?", ["opposite/hypotenuse", "adjacent/hypotenuse", "opposite/adjacent", "hypotenuse/opposite"]),
-                ("What is cosine in a right triangle?", ["adjacent/hypotenuse", "opposite/hypotenuse", "opposite/adjacent", "hypotenuse/adjacent"]),
-                ("What is tangent in a right triangle?", ["opposite/adjacent", "adjacent/opposite", "opposite/hypotenuse", "adjacent/hypotenuse"]),
-                ("What is the unit circle?", ["Circle with radius 1", "Circle with radius 2", "Any circle", "Circle with diameter 1"]),
-                ("What is the period of sin(x)?", ["2π", "π", "π/2", "4π"]),
-            ]
-        }
-        
-        templates = question_templates.get(topic.lower(), question_templates['algebra'])
-        
-        for i in range(min(count, len(templates))):
-            question_text, options = templates[i]
-            question = QuizQuestion(
-                id=str(uuid.uuid4()),
-                question=question_text,
-                options=options,
-                correct_answer=options[0],  # First option is correct
-                topic=topic,
-                difficulty_level=difficulty,
-                resource_id=""
-            )
-            questions.append(question)
-        
-        # If we need more questions, repeat with variations
-        while len(questions) < count:
-            template_idx = len(questions) % len(templates)
-            question_text, options = templates[template_idx]
-            question = QuizQuestion(
-                id=str(uuid.uuid4()),
-                question=f"Advanced: {question_text}",
-                options=options,
-                correct_answer=options[0],
-                topic=topic,
-                difficulty_level=difficulty,
-                resource_id=""
-            )
-            questions.append(question)
-        
-        return questions[:count]
-    
-    def analyze_weak_areas(self, quiz_results: List[Dict]) -> List[str]:
-        """Analyze quiz results to identify weak areas using Gemini AI"""
-        try:
-            if not quiz_results:
-                return []
-            
-            prompt = f"""{self.system_context}
-
-TASK: Analyze quiz results and identify weak learning areas.
-
-Quiz Results:
-{json.dumps(quiz_results, indent=2)}
-
-Based on incorrect answers and topics, identify the main weak areas that need attention.
-Return only a JSON array of weak area topics (maximum 5 topics).
-
-Example format: ["algebra", "geometry", "calculus"]
-
-Return only the JSON array without any additional text:"""
-            
-            response = self.gemini.generate(prompt, max_tokens=500)
-            
-            # Try to extract JSON array
-            try:
-                start = response.find('[')
-                end = response.rfind(']')
-                if start != -1 and end != -1:
-                    weak_areas = json.loads(response[start:end+1])
-                    return weak_areas if isinstance(weak_areas, list) else []
-            except:
-                pass
-            
-            # Fallback to simple analysis
-            incorrect_topics = []
-            for result in quiz_results:
-                if not result.get('is_correct', False):
-                    topic = result.get('topic', '').lower()
-                    if topic:
-                        incorrect_topics.append(topic)
-            return list(set(incorrect_topics))
-            
-        except Exception as e:
-            print(f"❌ Error analyzing weak areas: {e}")
-            # Fallback analysis
-            incorrect_topics = []
-            for result in quiz_results:
-                if not result.get('is_correct', False):
-                    topic = result.get('topic', '').lower()
-                    if topic:
-                        incorrect_topics.append(topic)
-            return list(set(incorrect_topics))
\ No newline at end of file
+# agents/content_generator.py
+import asyncio
+import hashlib
+import os
+import random
+import re
+import string
+import threading
+import types
+from collections import OrderedDict
+from typing import List, Dict
+from dataclasses import dataclass
+import aiohttp
+import fastjsonschema
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .llm_cache import LLMCache
+from .models import QuizQuestion
+
+GEMINI_MODEL = 'gemini-1.5-flash'
+# Smaller distilled variant: noticeably faster and cheaper, good enough for
+# boilerplate low-difficulty content
+GEMINI_LITE_MODEL = 'gemini-1.5-flash-8b'
+GEMINI_URL_TEMPLATE = 'https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent'
+
+# Connect fast or fail fast; reads get long enough for full generations
+GEMINI_CONNECT_TIMEOUT = 3
+GEMINI_READ_TIMEOUT = 30
+
+class GeminiPermanentError(Exception):
+    """Non-retryable Gemini failure (auth, quota, bad request)"""
+    pass
+
+def _batch_ids(count: int) -> List[str]:
+    """Generate hex question ids from a single urandom call instead of one
+    uuid4 (and its own urandom syscall) per question"""
+    raw = os.urandom(16 * count)
+    return [raw[i * 16:(i + 1) * 16].hex() for i in range(count)]
+
+def _build_payload(prompt: str, max_tokens: int, response_schema: Dict = None) -> Dict:
+    """Build a generateContent request payload"""
+    payload = {
+        "contents": [
+            {
+                "parts": [
+                    {
+                        "text": prompt
+                    }
+                ]
+            }
+        ],
+        "generationConfig": {
+            "temperature": 0.7,
+            "maxOutputTokens": max_tokens,
+            "topP": 0.8,
+            "topK": 40
+        }
+    }
+    if response_schema:
+        payload["generationConfig"]["responseMimeType"] = "application/json"
+        payload["generationConfig"]["responseSchema"] = response_schema
+    return payload
+
+# Markdown-fence handling: nearly every fenced Gemini response is exactly
+# ```json ... ```, so literal prefix/suffix strips cover the common case and
+# the precompiled regex is only a fallback for odd placements
+_MD_PREFIXES = ('```json\n', '```json ', '```json', '```\n', '```')
+_MD_FENCE_RE = re.compile(r'```json\s*|```\s*')
+
+# Shared aiohttp session so every Gemini call reuses a warm keep-alive TLS
+# connection instead of paying a fresh TCP+TLS handshake per request.
+# aiohttp binds a session to the loop that created it, so the owning loop is
+# tracked alongside the session and a different (or dead) loop gets a fresh
+# one instead of "Event loop is closed" errors
+_aiohttp_session = None
+_aiohttp_session_loop = None
+
+async def get_gemini_session() -> aiohttp.ClientSession:
+    global _aiohttp_session, _aiohttp_session_loop
+    loop = asyncio.get_running_loop()
+    if (_aiohttp_session is None or _aiohttp_session.closed
+            or _aiohttp_session_loop is not loop):
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            keepalive_timeout=30,
+            ttl_dns_cache=300
+        )
+        _aiohttp_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                connect=GEMINI_CONNECT_TIMEOUT,
+                total=GEMINI_READ_TIMEOUT
+            )
+        )
+        _aiohttp_session_loop = loop
+    return _aiohttp_session
+
+# One persistent event loop on a daemon thread owns all async agent work.
+# The Flask routes are sync; if each called asyncio.run, every request would
+# spin up a throwaway loop and orphan the keep-alive session created on it.
+# Funnelling every coroutine through this loop keeps a single warm session
+# for the life of the process.
+_async_loop = asyncio.new_event_loop()
+threading.Thread(target=_async_loop.run_forever, name='agent-async-loop', daemon=True).start()
+
+def run_async(coro):
+    """Run a coroutine on the shared agent loop and block for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop).result()
+
+def submit_async(coro):
+    """Schedule a coroutine on the shared agent loop without waiting"""
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop)
+
+# Structured-output schema so Gemini returns guaranteed-parseable quiz JSON
+# instead of free text that needs regex/brace-counting cleanup
+QUIZ_QUESTIONS_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "question": {"type": "STRING"},
+            "options": {"type": "ARRAY", "items": {"type": "STRING"}},
+            "correct_answer": {"type": "STRING"},
+            "topic": {"type": "STRING"}
+        },
+        "required": ["question", "options", "correct_answer"]
+    }
+}
+
+# Fallback question bank, built once at import time: frozen mapping of
+# lowercased topic -> (question, options) tuples so no dicts or lists are
+# rebuilt per call
+_QUESTION_TEMPLATES = types.MappingProxyType({
+    'algebra': (
+        ("What is a variable in algebra?", ("A letter representing an unknown", "A constant number", "An operation", "A graph")),
+        ("How do you solve x + 5 = 10?", ("Subtract 5 from both sides", "Add 5 to both sides", "Multiply by 5", "Divide by 5")),
+        ("What is a linear equation?", ("An equation with degree 1", "An equation with degree 2", "A curved line", "A circle")),
+        ("What does 'like terms' mean?", ("Terms with same variables and powers", "Any two numbers", "Equal signs", "Multiplication terms")),
+        ("What is the order of operations?", ("PEMDAS/BODMAS", "Left to right always", "Addition first", "Random order")),
+    ),
+    'calculus': (
+        ("What is a limit?", ("Value a function approaches", "Maximum value", "Minimum value", "Average value")),
+        ("What is a derivative?", ("Rate of change", "Area under curve", "Maximum point", "Minimum point")),
+        ("What is integration?", ("Finding area under curve", "Finding slope", "Finding maximum", "Finding minimum")),
+        ("What does continuity mean?", ("No breaks in function", "Always increasing", "Always positive", "Has a maximum")),
+        ("What is the fundamental theorem?", ("Links derivatives and integrals", "States all functions continuous", "Proves limits exist", "Shows functions are smooth")),
+    ),
+    'geometry': (
+        ("Sum of angles in a triangle?", ("180 degrees", "360 degrees", "90 degrees", "270 degrees")),
+        ("Area of a rectangle?", ("length × width", "2(length + width)", "length + width", "length²")),
+        ("What is a right angle?", ("90 degrees", "180 degrees", "45 degrees", "60 degrees")),
+        ("What is the Pythagorean theorem?", ("a² + b² = c²", "a + b = c", "a × b = c", "a² = b² + c²")),
+        ("How many sides does a hexagon have?", ("6", "5", "7", "8")),
+    ),
+    'trigonometry': (
+        ("What is sine in a right triangle?", ("opposite/hypotenuse", "adjacent/hypotenuse", "opposite/adjacent", "hypotenuse/opposite")),
+        ("What is cosine in a right triangle?", ("adjacent/hypotenuse", "opposite/hypotenuse", "opposite/adjacent", "hypotenuse/adjacent")),
+        ("What is tangent in a right triangle?", ("opposite/adjacent", "adjacent/opposite", "opposite/hypotenuse", "adjacent/hypotenuse")),
+        ("What is the unit circle?", ("Circle with radius 1", "Circle with radius 2", "Any circle", "Circle with diameter 1")),
+        ("What is the period of sin(x)?", ("2π", "π", "π/2", "4π")),
+    )
+})
+
+# Compiled once at import: fastjsonschema generates specialized validation
+# code, replacing the per-question isinstance/membership checks
+_QUESTIONS_VALIDATOR = fastjsonschema.compile({
+    "type": "array",
+    "items": {
+        "type": "object",
+        "required": ["question", "options", "correct_answer"],
+        "properties": {
+            "question": {"type": "string"},
+            "options": {"type": "array", "minItems": 4},
+            "correct_answer": {"type": "string"}
+        }
+    }
+})
+
+# In-process LRU cache over Gemini completions: identical prompts (basic quiz
+# templates, repeated wrong answers, identical result sets) return in
+# microseconds instead of paying a network round-trip. Request threads,
+# to_thread workers and the agent loop all touch it, so access is locked the
+# same way LLMCache guards its sqlite connection
+_PROMPT_CACHE_SIZE = 1024
+_prompt_cache = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+_inflight_requests = {}
+
+def _prompt_cache_key(prompt: str, max_tokens: int, model: str = None) -> tuple:
+    digest = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+    return (digest, max_tokens, model)
+
+def _prompt_cache_get(key):
+    with _prompt_cache_lock:
+        if key in _prompt_cache:
+            _prompt_cache.move_to_end(key)
+            return _prompt_cache[key]
+    return None
+
+def _prompt_cache_put(key, value):
+    with _prompt_cache_lock:
+        _prompt_cache[key] = value
+        if len(_prompt_cache) > _PROMPT_CACHE_SIZE:
+            _prompt_cache.popitem(last=False)
+
+class GeminiClient:
+    def __init__(self, api_key: str, model: str = GEMINI_MODEL):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = GEMINI_URL_TEMPLATE.format(model=model)
+        # Pooled session: calls after the first reuse the TLS connection, and
+        # transient upstream errors retry with backoff inside urllib3.
+        # POST isn't in urllib3's default retryable methods, so it must be
+        # allowed explicitly; generateContent is safe to repeat on 429/5xx
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset({'POST'})
+            )
+        ))
+
+    def _url_for(self, model: str = None) -> str:
+        if model is None or model == self.model:
+            return self.base_url
+        return GEMINI_URL_TEMPLATE.format(model=model)
+
+    def generate(self, prompt: str, max_tokens: int = 2048, response_schema: Dict = None, model: str = None, use_cache: bool = True) -> str:
+        """Generate text using Gemini AI API
+
+        use_cache=False forces a live call — health probes need to observe
+        the actual upstream, not a completion cached from an earlier success.
+        """
+        cache_key = _prompt_cache_key(prompt, max_tokens, model or self.model)
+        if use_cache:
+            cached = _prompt_cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            url = f"{self._url_for(model)}?key={self.api_key}"
+
+            payload = _build_payload(prompt, max_tokens, response_schema)
+
+            print(f"🤖 Sending request to Gemini AI...")
+            response = self.session.post(
+                url,
+                json=payload,
+                headers={'Content-Type': 'application/json'},
+                timeout=(GEMINI_CONNECT_TIMEOUT, GEMINI_READ_TIMEOUT)
+            )
+            response.raise_for_status()
+
+            result = response.json()
+
+            if 'candidates' in result and len(result['candidates']) > 0:
+                if 'content' in result['candidates'][0]:
+                    if 'parts' in result['candidates'][0]['content']:
+                        text = result['candidates'][0]['content']['parts'][0]['text']
+                        if use_cache:
+                            _prompt_cache_put(cache_key, text)
+                        return text
+
+            print(f"❌ Unexpected Gemini response format: {result}")
+            return ""
+
+        except requests.exceptions.HTTPError as e:
+            print(f"❌ Gemini request error: {e}")
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and status < 500 and status != 429:
+                raise GeminiPermanentError(f"Gemini request rejected ({status}): {e}")
+            raise Exception(f"Failed to connect to Gemini AI: {e}")
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Gemini request error: {e}")
+            raise Exception(f"Failed to connect to Gemini AI: {e}")
+        except GeminiPermanentError:
+            raise
+        except Exception as e:
+            print(f"❌ Gemini error: {e}")
+            raise Exception(f"Gemini generation failed: {e}")
+
+class AsyncGeminiClient:
+    """Async Gemini client backed by a pooled aiohttp session with keep-alive"""
+
+    def __init__(self, api_key: str, model: str = GEMINI_MODEL):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = GEMINI_URL_TEMPLATE.format(model=model)
+
+    def _url_for(self, model: str = None) -> str:
+        if model is None or model == self.model:
+            return self.base_url
+        return GEMINI_URL_TEMPLATE.format(model=model)
+
+    async def generate(self, prompt: str, max_tokens: int = 2048, response_schema: Dict = None, model: str = None) -> str:
+        """Generate text using Gemini AI API without blocking the event loop
+
+        Completions are cached by (prompt hash, max_tokens, model);
+        concurrent identical prompts on the same loop coalesce into one
+        upstream call.
+        """
+        cache_key = _prompt_cache_key(prompt, max_tokens, model or self.model)
+        cached = _prompt_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        inflight = _inflight_requests.get(cache_key)
+        if inflight is not None and inflight[0] is loop:
+            return await inflight[1]
+
+        future = loop.create_future()
+        _inflight_requests[cache_key] = (loop, future)
+        try:
+            text = await self._generate_uncached(prompt, max_tokens, response_schema, model)
+            # An unexpected response format comes back as ""; caching it
+            # would poison the prompt for every retry until LRU eviction
+            if text:
+                _prompt_cache_put(cache_key, text)
+            if not future.done():
+                future.set_result(text)
+            return text
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+                future.exception()  # mark retrieved if nobody else is waiting
+            raise
+        finally:
+            _inflight_requests.pop(cache_key, None)
+
+    async def generate_stream(self, prompt: str, max_tokens: int = 2048, response_schema: Dict = None, model: str = None):
+        """Stream a Gemini completion via streamGenerateContent, yielding text
+        fragments as they arrive so callers can start work before the model
+        finishes the full response"""
+        url = (
+            f"{self._url_for(model).replace(':generateContent', ':streamGenerateContent')}"
+            f"?alt=sse&key={self.api_key}"
+        )
+        payload = _build_payload(prompt, max_tokens, response_schema)
+
+        session = await get_gemini_session()
+        async with session.post(
+            url,
+            json=payload,
+            headers={'Content-Type': 'application/json'}
+        ) as response:
+            try:
+                response.raise_for_status()
+            except aiohttp.ClientResponseError as e:
+                # Same classification as the non-streaming path: auth/quota/
+                # bad-request errors are not retryable, so callers can skip
+                # their backoff loops and fall back immediately
+                if e.status and e.status < 500 and e.status != 429:
+                    raise GeminiPermanentError(f"Gemini request rejected ({e.status}): {e.message}")
+                raise
+            async for raw_line in response.content:
+                line = raw_line.strip()
+                if not line.startswith(b'data:'):
+                    continue
+                data = line[5:].strip()
+                if not data or data == b'[DONE]':
+                    continue
+                try:
+                    chunk = orjson.loads(data)
+                    text = chunk['candidates'][0]['content']['parts'][0]['text']
+                except (orjson.JSONDecodeError, KeyError, IndexError):
+                    continue
+                if text:
+                    yield text
+
+    async def _generate_uncached(self, prompt: str, max_tokens: int, response_schema: Dict = None, model: str = None) -> str:
+        try:
+            url = f"{self._url_for(model)}?key={self.api_key}"
+
+            payload = _build_payload(prompt, max_tokens, response_schema)
+
+            print(f"🤖 Sending request to Gemini AI...")
+            session = await get_gemini_session()
+            async with session.post(
+                url,
+                json=payload,
+                headers={'Content-Type': 'application/json'}
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
+
+            if 'candidates' in result and len(result['candidates']) > 0:
+                if 'content' in result['candidates'][0]:
+                    if 'parts' in result['candidates'][0]['content']:
+                        return result['candidates'][0]['content']['parts'][0]['text']
+
+            print(f"❌ Unexpected Gemini response format: {result}")
+            return ""
+
+        except aiohttp.ClientResponseError as e:
+            print(f"❌ Gemini request error: {e}")
+            if e.status and e.status < 500 and e.status != 429:
+                raise GeminiPermanentError(f"Gemini request rejected ({e.status}): {e.message}")
+            raise Exception(f"Failed to connect to Gemini AI: {e}")
+        except aiohttp.ClientError as e:
+            print(f"❌ Gemini request error: {e}")
+            raise Exception(f"Failed to connect to Gemini AI: {e}")
+        except Exception as e:
+            print(f"❌ Gemini error: {e}")
+            raise Exception(f"Gemini generation failed: {e}")
+
+class ContentGeneratorAgent:
+    """AI Agent for generating educational content using Gemini AI"""
+    
+    def __init__(self, gemini_api_key: str):
+        self.gemini = AsyncGeminiClient(gemini_api_key)
+        self.response_cache = LLMCache()
+        self.agent_name = "ContentGenerator"
+        self.system_context = """You are an expert educational content generator.
+        Your role is to create high-quality learning materials, quizzes, and analyze learning patterns."""
+        # Prompt header never changes per instance; build the template once
+        # and only substitute topic/difficulty/count per call
+        self._quiz_prompt_tpl = string.Template(f"""{self.system_context}
+
+TASK: Create exactly $count multiple choice questions about $topic at difficulty level $difficulty out of 5.
+
+REQUIREMENTS:
+- Each question must have exactly 4 options
+- Difficulty level $difficulty/5 where 1=beginner, 5=expert
+- Focus specifically on $topic
+- Return ONLY valid JSON format
+- Make questions educational and accurate
+- Ensure one correct answer per question
+
+FORMAT (return exactly this structure):
+[
+  {{
+    "question": "What is the main concept of $topic?",
+    "options": ["Correct Answer", "Wrong Option 1", "Wrong Option 2", "Wrong Option 3"],
+    "correct_answer": "Correct Answer",
+    "topic": "$topic"
+  }}
+]
+
+Create $count questions about $topic now. Return only the JSON array without any additional text or formatting:""")
+
+    async def generate_quiz_questions(self, topic: str, difficulty: int, count: int = 5) -> List[QuizQuestion]:
+        """Generate quiz questions using Gemini AI"""
+        
+        max_retries = 3
+        retry_count = 0
+        
+        # The question set is fully determined by (topic, difficulty, count);
+        # the persistent cache survives restarts, and fresh ids are minted
+        # below on every parse so cached sets stay distinct per quiz
+        cache_key = LLMCache.make_key(
+            kind='quiz_questions', topic=topic, difficulty=difficulty, count=count
+        )
+        cached_text = self.response_cache.get(cache_key)
+        
+        while retry_count < max_retries:
+            try:
+                print(f"🤖 Generating {count} questions for topic: {topic}, difficulty: {difficulty}/5 (attempt {retry_count + 1})")
+                
+                if cached_text is not None:
+                    response_text = cached_text
+                else:
+                    prompt = self._quiz_prompt_tpl.substitute(topic=topic, difficulty=difficulty, count=count)
+                    
+                    response_text = await self.gemini.generate(
+                        prompt, max_tokens=2048, response_schema=QUIZ_QUESTIONS_SCHEMA
+                    )
+
+                if not response_text:
+                    raise Exception("Empty response from Gemini AI")
+
+                print(f"📥 Raw Gemini response: {response_text[:300]}...")
+
+                # Schema-constrained output parses directly
+                questions_data = orjson.loads(response_text)
+                
+                if not isinstance(questions_data, list):
+                    raise ValueError("Response is not a JSON array")
+                
+                # Take only the requested number of questions
+                questions_data = questions_data[:count]
+
+                # Validate the whole array in one compiled-validator call
+                _QUESTIONS_VALIDATOR(questions_data)
+
+                # Build all questions in one comprehension; options are
+                # clamped to 4 and the correct answer coerced into them
+                ids = _batch_ids(len(questions_data))
+                questions = [
+                    QuizQuestion(
+                        id=ids[i],
+                        question=q_data['question'],
+                        options=(options := q_data['options'][:4]),
+                        correct_answer=(
+                            q_data['correct_answer']
+                            if q_data['correct_answer'] in options
+                            else options[0]
+                        ),
+                        topic=q_data.get('topic', topic),
+                        difficulty_level=difficulty,
+                        resource_id=""
+                    )
+                    for i, q_data in enumerate(questions_data)
+                ]
+                
+                if len(questions) >= count:
+                    questions = questions[:count]
+                    if cached_text is None:
+                        self.response_cache.set(cache_key, response_text)
+                    print(f"✅ Successfully generated {len(questions)} questions")
+                    return questions
+                else:
+                    raise ValueError(f"Generated only {len(questions)} valid questions, need {count}")
+                
+            except orjson.JSONDecodeError as e:
+                print(f"❌ JSON parsing error (attempt {retry_count + 1}): {e}")
+                print(f"Response text: {response_text}")
+                cached_text = None
+                retry_count += 1
+                await asyncio.sleep(min(8, 0.5 * (2 ** retry_count) + random.random() * 0.3))
+
+            except GeminiPermanentError as e:
+                # Auth/quota/bad-request failures won't heal on retry
+                print(f"❌ Non-retryable Gemini error: {e}")
+                break
+
+            except Exception as e:
+                print(f"❌ Error generating questions (attempt {retry_count + 1}): {e}")
+                cached_text = None
+                retry_count += 1
+                await asyncio.sleep(min(8, 0.5 * (2 ** retry_count) + random.random() * 0.3))
+        
+        # If all retries failed, generate simple questions
+        print("⚠️ Gemini AI failed, generating basic questions")
+        return self._generate_basic_questions(topic, difficulty, count)
+    
+    def _clean_json_response(self, response_text: str) -> str:
+        """Clean the Gemini response to extract valid JSON"""
+
+        # Remove markdown code blocks if present; literal strip first,
+        # regex only if fences remain somewhere unexpected
+        response_text = response_text.strip()
+        for prefix in _MD_PREFIXES:
+            if response_text.startswith(prefix):
+                response_text = response_text[len(prefix):]
+                break
+        if response_text.endswith('```'):
+            response_text = response_text[:-3]
+        if '```' in response_text:
+            response_text = _MD_FENCE_RE.sub('', response_text)
+
+        # Find JSON array boundaries
+        start_idx = response_text.find('[')
+        end_idx = response_text.rfind(']')
+
+        if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
+            return response_text[start_idx:end_idx + 1]
+
+        # Fallback: one brace-depth walk over the raw string to pick out
+        # top-level objects, then wrap them in an array
+        objects = []
+        depth = 0
+        start = -1
+        for i, char in enumerate(response_text):
+            if char == '{':
+                if depth == 0:
+                    start = i
+                depth += 1
+            elif char == '}' and depth > 0:
+                depth -= 1
+                if depth == 0:
+                    try:
+                        objects.append(orjson.loads(response_text[start:i + 1]))
+                    except orjson.JSONDecodeError:
+                        pass
+
+        if objects:
+            return orjson.dumps(objects).decode()
+
+        return response_text
+    
+    def _generate_basic_questions(self, topic: str, difficulty: int, count: int) -> List[QuizQuestion]:
+        """Generate basic questions when Gemini AI fails"""
+        questions = []
+        
+        templates = _QUESTION_TEMPLATES.get(topic.lower(), _QUESTION_TEMPLATES['algebra'])
+        ids = _batch_ids(count)
+        
+        for i in range(min(count, len(templates))):
+            question_text, options = templates[i]
+            question = QuizQuestion(
+                id=ids[i],
+                question=question_text,
+                options=list(options),
+                correct_answer=options[0],  # First option is correct
+                topic=topic,
+                difficulty_level=difficulty,
+                resource_id=""
+            )
+            questions.append(question)
+        
+        # If we need more questions, repeat with variations
+        while len(questions) < count:
+            template_idx = len(questions) % len(templates)
+            question_text, options = templates[template_idx]
+            question = QuizQuestion(
+                id=ids[len(questions)],
+                question=f"Advanced: {question_text}",
+                options=list(options),
+                correct_answer=options[0],
+                topic=topic,
+                difficulty_level=difficulty,
+                resource_id=""
+            )
+            questions.append(question)
+        
+        return questions[:count]
+    
+    async def analyze_weak_areas(self, quiz_results: List[Dict]) -> List[str]:
+        """Analyze quiz results to identify weak areas using Gemini AI"""
+        try:
+            if not quiz_results:
+                return []
+            
+            prompt = f"""{self.system_context}
+
+TASK: Analyze quiz results and identify weak learning areas.
+
+Quiz Results:
+{orjson.dumps(quiz_results, option=orjson.OPT_SORT_KEYS).decode()}
+
+Based on incorrect answers and topics, identify the main weak areas that need attention.
+Return only a JSON array of weak area topics (maximum 5 topics).
+
+Example format: ["algebra", "geometry", "calculus"]
+
+Return only the JSON array without any additional text:"""
+            
+            response = await self.gemini.generate(prompt, max_tokens=500)
+
+            # Try to extract JSON array
+            try:
+                start = response.find('[')
+                end = response.rfind(']')
+                if start != -1 and end != -1:
+                    weak_areas = orjson.loads(response[start:end+1])
+                    return weak_areas if isinstance(weak_areas, list) else []
+            except:
+                pass
+            
+            # Fallback to simple analysis: dedup in one ordered pass
+            return list(dict.fromkeys(
+                result.get('topic', '').lower()
+                for result in quiz_results
+                if not result.get('is_correct', False) and result.get('topic')
+            ))
+            
+        except Exception as e:
+            print(f"❌ Error analyzing weak areas: {e}")
+            # Fallback analysis
+            return list(dict.fromkeys(
+                result.get('topic', '').lower()
+                for result in quiz_results
+                if not result.get('is_correct', False) and result.get('topic')
+            ))
\ No newline at end of file
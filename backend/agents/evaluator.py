@@ -1,104 +1,226 @@
-# agents/evaluator.py
-from typing import Dict, List, Any
-from .content_generator import GeminiClient
-from .models import QuizQuestion
-
-class EvaluatorAgent:
-    """AI Agent for evaluating quiz responses and providing feedback using Gemini AI"""
-    
-    def __init__(self, gemini_api_key: str):
-        self.gemini = GeminiClient(gemini_api_key)
-        self.agent_name = "QuizEvaluator"
-        self.system_context = """You are an educational assessment expert. 
-        Your role is to evaluate quiz responses and provide constructive, encouraging feedback."""
-    
-    def evaluate_quiz_response(self, question: QuizQuestion, user_answer: str) -> Dict[str, Any]:
-        """Evaluate quiz response using Gemini AI"""
-        
-        is_correct = user_answer.strip().lower() == question.correct_answer.strip().lower()
-        
-        try:
-            prompt = f"""{self.system_context}
-
-TASK: Provide educational feedback for this quiz question.
-
-QUESTION: {question.question}
-OPTIONS: {', '.join(question.options)}
-CORRECT ANSWER: {question.correct_answer}
-USER ANSWER: {user_answer}
-RESULT: {'CORRECT' if is_correct else 'INCORRECT'}
-
-Write helpful, encouraging feedback (2-3 sentences) that:
-1. Explains why the answer is correct/incorrect
-2. Provides a learning tip or concept explanation
-3. Encourages continued learning
-
-Keep the tone positive and educational. Return only the feedback text without any additional formatting:"""
-            
-            response = self.gemini.generate(prompt, max_tokens=300)
-            feedback = response.strip() if response else f"Your answer is {'correct' if is_correct else 'incorrect'}."
-            
-        except Exception as e:
-            print(f"❌ Error generating feedback: {e}")
-            feedback = f"Your answer is {'correct' if is_correct else 'incorrect'}. The correct answer is {question.correct_answer}."
-        
-        return {
-            'is_correct': is_correct,
-            'feedback': feedback,
-            'topic': question.topic,
-            'score': 100 if is_correct else 0
-        }
-    
-    def generate_overall_feedback(self, quiz_results: List[Dict]) -> Dict[str, Any]:
-        """Generate overall feedback for quiz performance using Gemini AI"""
-        if not quiz_results:
-            return {
-                'average_score': 0,
-                'total_questions': 0,
-                'correct_answers': 0,
-                'weak_topics': [],
-                'strong_topics': [],
-                'recommendation': 'No quiz data available'
-            }
-        
-        total_score = sum(r.get('score', 0) for r in quiz_results)
-        average_score = total_score / len(quiz_results)
-        
-        weak_topics = [r['topic'] for r in quiz_results if not r.get('is_correct', False)]
-        strong_topics = [r['topic'] for r in quiz_results if r.get('is_correct', False)]
-        
-        try:
-            prompt = f"""{self.system_context}
-
-TASK: Provide an encouraging recommendation based on quiz performance.
-
-PERFORMANCE DATA:
-- Score: {average_score:.1f}%
-- Correct: {len(strong_topics)}/{len(quiz_results)}
-- Strong areas: {list(set(strong_topics))}
-- Areas to improve: {list(set(weak_topics))}
-
-Write an encouraging 1-2 sentence recommendation that:
-1. Acknowledges their effort
-2. Provides specific guidance for improvement
-3. Motivates continued learning
-
-Return only the recommendation text without any additional formatting:"""
-            
-            response = self.gemini.generate(prompt, max_tokens=200)
-            recommendation = response.strip() if response else (
-                'Great job! Keep up the good work!' if average_score >= 70 else 'Keep practicing to improve your understanding!'
-            )
-            
-        except Exception as e:
-            print(f"❌ Error generating recommendation: {e}")
-            recommendation = 'Great job! Keep up the good work!' if average_score >= 70 else 'Keep practicing to improve!'
-        
-        return {
-            'average_score': average_score,
-            'total_questions': len(quiz_results),
-            'correct_answers': len(strong_topics),
-            'weak_topics': list(set(weak_topics)),
-            'strong_topics': list(set(strong_topics)),
-            'recommendation': recommendation
+# agents/evaluator.py
+import string
+from typing import Dict, List, Any, Tuple
+import orjson
+from .content_generator import AsyncGeminiClient
+from .models import QuizQuestion
+
+# Structured-output schema: one feedback string per incorrect answer
+FEEDBACK_LIST_SCHEMA = {
+    "type": "ARRAY",
+    "items": {"type": "STRING"}
+}
+
+class EvaluatorAgent:
+    """AI Agent for evaluating quiz responses and providing feedback using Gemini AI"""
+
+    def __init__(self, gemini_api_key: str):
+        self.gemini = AsyncGeminiClient(gemini_api_key)
+        self.agent_name = "QuizEvaluator"
+        self.system_context = """You are an educational assessment expert.
+        Your role is to evaluate quiz responses and provide constructive, encouraging feedback."""
+        # Static prompt bodies are templated once here; call sites only
+        # substitute the per-question / per-quiz values
+        self._feedback_prompt_tpl = string.Template(f"""{self.system_context}
+
+TASK: Provide educational feedback for this quiz question.
+
+QUESTION: $question
+OPTIONS: $options
+CORRECT ANSWER: $correct_answer
+USER ANSWER: $user_answer
+RESULT: INCORRECT
+
+Write helpful, encouraging feedback (2-3 sentences) that:
+1. Explains why the answer is correct/incorrect
+2. Provides a learning tip or concept explanation
+3. Encourages continued learning
+
+Keep the tone positive and educational. Return only the feedback text without any additional formatting:""")
+        self._batch_feedback_prompt_tpl = string.Template(f"""{self.system_context}
+
+TASK: Provide educational feedback for each of these $count incorrectly answered quiz questions.
+
+$listing
+
+For each item write helpful, encouraging feedback (2-3 sentences) that:
+1. Explains why the user's answer is incorrect
+2. Provides a learning tip or concept explanation
+3. Encourages continued learning
+
+Return a JSON array of exactly $count feedback strings, in the same order as the items:""")
+        self._recommendation_prompt_tpl = string.Template(f"""{self.system_context}
+
+TASK: Provide an encouraging recommendation based on quiz performance.
+
+PERFORMANCE DATA:
+- Score: $average_score%
+- Correct: $correct_count/$total
+- Strong areas: $strong_topics
+- Areas to improve: $weak_topics
+
+Write an encouraging 1-2 sentence recommendation that:
+1. Acknowledges their effort
+2. Provides specific guidance for improvement
+3. Motivates continued learning
+
+Return only the recommendation text without any additional formatting:""")
+
+    async def evaluate_quiz_response(self, question: QuizQuestion, user_answer: str) -> Dict[str, Any]:
+        """Evaluate quiz response using Gemini AI"""
+
+        is_correct = user_answer.strip().casefold() == question.correct_answer_norm
+
+        # Correct answers don't need pedagogy from the LLM — a template is
+        # enough and skips the dominant network cost
+        if is_correct:
+            return self._correct_result(question.correct_answer, question.topic)
+
+        try:
+            prompt = self._feedback_prompt_tpl.substitute(
+                question=question.question,
+                options=', '.join(question.options),
+                correct_answer=question.correct_answer,
+                user_answer=user_answer
+            )
+            
+            response = await self.gemini.generate(prompt, max_tokens=300)
+            feedback = response.strip() if response else f"Your answer is {'correct' if is_correct else 'incorrect'}."
+            
+        except Exception as e:
+            print(f"❌ Error generating feedback: {e}")
+            feedback = f"Your answer is {'correct' if is_correct else 'incorrect'}. The correct answer is {question.correct_answer}."
+        
+        return {
+            'is_correct': is_correct,
+            'feedback': feedback,
+            'topic': question.topic,
+            'score': 100 if is_correct else 0
+        }
+    
+    def _correct_result(self, correct_answer: str, topic: str) -> Dict[str, Any]:
+        return {
+            'is_correct': True,
+            'feedback': f"Correct! {correct_answer} is the right answer. Great work — keep it up!",
+            'topic': topic,
+            'score': 100
+        }
+
+    async def evaluate_quiz_batch(self, pairs: List[Tuple[Dict[str, Any], str]]) -> Tuple[List[Dict], Dict[str, Any]]:
+        """Evaluate a full quiz, then generate overall feedback
+
+        Takes the stored question documents as-is, so callers don't have to
+        rehydrate QuizQuestion objects just for this call. Correctness is
+        decided locally for every answer; only the incorrect ones need LLM
+        feedback, and those collapse into a single batched Gemini call
+        instead of one round-trip per question.
+        """
+        results = []
+        incorrect = []
+        for question, user_answer in pairs:
+            # Documents written before the norm field existed fall back to
+            # normalizing the stored answer here
+            norm = question.get('correct_answer_norm') or question['correct_answer'].strip().casefold()
+            is_correct = user_answer.strip().casefold() == norm
+            if is_correct:
+                results.append(self._correct_result(question['correct_answer'], question['topic']))
+            else:
+                results.append(None)
+                incorrect.append((len(results) - 1, question, user_answer))
+
+        if incorrect:
+            feedbacks = await self._generate_incorrect_feedback(
+                [(question, user_answer) for _, question, user_answer in incorrect]
+            )
+            for (index, question, _), feedback in zip(incorrect, feedbacks):
+                results[index] = {
+                    'is_correct': False,
+                    'feedback': feedback,
+                    'topic': question['topic'],
+                    'score': 0
+                }
+
+        overall_feedback = await self.generate_overall_feedback(results)
+        return results, overall_feedback
+
+    async def _generate_incorrect_feedback(self, items: List[Tuple[Dict[str, Any], str]]) -> List[str]:
+        """Generate feedback for all incorrect answers with one Gemini call"""
+        try:
+            listing = "\n".join(
+                f"{i + 1}. QUESTION: {question['question']} | OPTIONS: {', '.join(question['options'])} | "
+                f"CORRECT ANSWER: {question['correct_answer']} | USER ANSWER: {user_answer}"
+                for i, (question, user_answer) in enumerate(items)
+            )
+
+            prompt = self._batch_feedback_prompt_tpl.substitute(count=len(items), listing=listing)
+
+            response = await self.gemini.generate(
+                prompt, max_tokens=300 * len(items), response_schema=FEEDBACK_LIST_SCHEMA
+            )
+            feedbacks = orjson.loads(response)
+            if isinstance(feedbacks, list) and len(feedbacks) == len(items):
+                return [str(feedback).strip() for feedback in feedbacks]
+            raise ValueError(f"Expected {len(items)} feedback strings, got {feedbacks!r:.200}")
+
+        except Exception as e:
+            print(f"❌ Error generating batched feedback: {e}")
+            return [
+                f"Your answer is incorrect. The correct answer is {question['correct_answer']}."
+                for question, _ in items
+            ]
+
+    async def generate_overall_feedback(self, quiz_results: List[Dict]) -> Dict[str, Any]:
+        """Generate overall feedback for quiz performance using Gemini AI"""
+        if not quiz_results:
+            return {
+                'average_score': 0,
+                'total_questions': 0,
+                'correct_answers': 0,
+                'weak_topics': [],
+                'strong_topics': [],
+                'recommendation': 'No quiz data available'
+            }
+        
+        total_score = 0
+        correct_count = 0
+        weak_seen = {}
+        strong_seen = {}
+        for result in quiz_results:
+            total_score += result.get('score', 0)
+            if result.get('is_correct', False):
+                correct_count += 1
+                strong_seen[result['topic']] = None
+            else:
+                weak_seen[result['topic']] = None
+
+        average_score = total_score / len(quiz_results)
+        # dict keys dedup in one pass while preserving insertion order
+        weak_topics = list(weak_seen)
+        strong_topics = list(strong_seen)
+
+        try:
+            prompt = self._recommendation_prompt_tpl.substitute(
+                average_score=f"{average_score:.1f}",
+                correct_count=correct_count,
+                total=len(quiz_results),
+                strong_topics=strong_topics,
+                weak_topics=weak_topics
+            )
+            
+            response = await self.gemini.generate(prompt, max_tokens=200)
+            recommendation = response.strip() if response else (
+                'Great job! Keep up the good work!' if average_score >= 70 else 'Keep practicing to improve your understanding!'
+            )
+            
+        except Exception as e:
+            print(f"❌ Error generating recommendation: {e}")
+            recommendation = 'Great job! Keep up the good work!' if average_score >= 70 else 'Keep practicing to improve!'
+        
+        return {
+            'average_score': average_score,
+            'total_questions': len(quiz_results),
+            'correct_answers': correct_count,
+            'weak_topics': weak_topics,
+            'strong_topics': strong_topics,
+            'recommendation': recommendation
         }
\ No newline at end of file
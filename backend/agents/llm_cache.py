@@ -0,0 +1,61 @@
+# agents/llm_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import orjson
+
+_DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '.llm_cache.sqlite3')
+
+class LLMCache:
+    """Persistent cache for raw LLM responses backed by sqlite
+
+    Content prompts are fully determined by their arguments plus the static
+    system context, so identical curricula (same topic/style across learners)
+    can skip the Gemini round-trip entirely. The raw response text is cached,
+    not the parsed objects, so ids stay fresh per learner.
+    """
+
+    def __init__(self, path: str = None, ttl: int = 7 * 86400):
+        self.path = path or os.getenv('LLM_CACHE_PATH', _DEFAULT_PATH)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS llm_cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(**parts) -> str:
+        """Stable key from keyword parts via canonical (sorted-key) JSON"""
+        canonical = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(canonical).hexdigest()
+
+    def get(self, key: str) -> str:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+        if row and row[1] > now:
+            self.hits += 1
+            return row[0]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, time.time() + self.ttl)
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'path': self.path}
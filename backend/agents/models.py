@@ -1,59 +1,118 @@
-# agents/models.py
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Dict, Any
-
-@dataclass
-class LearnerProfile:
-    id: str
-    name: str
-    learning_style: str
-    knowledge_level: int
-    subject: str
-    weak_areas: List[str]
-    created_at: datetime
-
-@dataclass
-class LearningResource:
-    id: str
-    title: str
-    type: str
-    content_url: str
-    difficulty_level: int
-    learning_style: str
-    topic: str
-    prerequisites: List[str]
-
-@dataclass
-class LearningPath:
-    id: str
-    learner_id: str
-    resources: List[str]
-    current_position: int
-    progress: Dict[str, Any]
-    created_at: datetime
-    updated_at: datetime
-
-@dataclass
-class QuizQuestion:
-    id: str
-    question: str
-    options: List[str]
-    correct_answer: str
-    topic: str
-    difficulty_level: int
-    resource_id: str
-
-@dataclass
-class LearningContent:
-    id: str
-    title: str
-    type: str  # 'lesson', 'video_script', 'interactive', 'practice'
-    content: str  # Generated content
-    summary: str
-    difficulty_level: int
-    learning_style: str
-    topic: str
-    estimated_duration: int  # in minutes
-    prerequisites: List[str]
-    learning_objectives: List[str]
\ No newline at end of file
+# agents/models.py
+import sys
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import List, Dict, Any, Sequence
+
+_FIELD_NAMES: Dict[type, tuple] = {}
+
+def shallow_asdict(dc) -> Dict[str, Any]:
+    """Flat dict of a model's fields, without dataclasses.asdict's deep copy
+
+    The models hold only primitives, datetimes and flat lists — all of which
+    pymongo encodes directly — so the recursive copy asdict performs is pure
+    overhead. Field names are resolved once per class.
+    """
+    cls = type(dc)
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(dc))
+    return {name: getattr(dc, name) for name in names}
+
+# slots=True on every model drops the per-instance __dict__: instances are
+# built once per request and read many times downstream, so the fixed slot
+# layout saves memory and speeds up attribute access
+@dataclass(slots=True)
+class LearnerProfile:
+    id: str
+    name: str
+    learning_style: str
+    knowledge_level: int
+    subject: str
+    weak_areas: List[str]
+    created_at: datetime
+
+    def __post_init__(self):
+        # These short categorical strings key dict lookups all over the
+        # routing and template code; interning makes those probes pointer
+        # compares
+        self.learning_style = sys.intern(self.learning_style)
+        self.subject = sys.intern(self.subject)
+
+@dataclass(slots=True)
+class LearningResource:
+    id: str
+    title: str
+    type: str
+    content_url: str
+    difficulty_level: int
+    learning_style: str
+    topic: str
+    prerequisites: List[str]
+
+@dataclass(slots=True)
+class LearningPath:
+    id: str
+    learner_id: str
+    resources: List[str]
+    current_position: int
+    progress: Dict[str, Any]
+    created_at: datetime
+    updated_at: datetime
+
+@dataclass(slots=True)
+class QuizQuestion:
+    id: str
+    question: str
+    options: List[str]
+    correct_answer: str
+    topic: str
+    difficulty_level: int
+    resource_id: str
+    # Normalized once at construction so answer checks don't redo the
+    # strip/casefold work; questions rehydrated from storage keep theirs
+    correct_answer_norm: str = ''
+
+    def __post_init__(self):
+        if not self.correct_answer_norm:
+            self.correct_answer_norm = self.correct_answer.strip().casefold()
+
+@dataclass(slots=True)
+class LearningContent:
+    id: str
+    title: str
+    type: str  # 'lesson', 'video_script', 'interactive', 'practice'
+    content: str  # Generated content
+    summary: str
+    difficulty_level: int
+    learning_style: str
+    topic: str
+    estimated_duration: int  # in minutes
+    prerequisites: List[str]
+    # tuple for template-backed content (shared across instances), list for
+    # freshly generated content
+    learning_objectives: Sequence[str]
+
+    def __post_init__(self):
+        self.type = sys.intern(self.type)
+        self.learning_style = sys.intern(self.learning_style)
+        self.topic = sys.intern(self.topic)
+
+    def to_resource_doc(self, learner_id: str, created_at: datetime, doc_id: str = None) -> Dict[str, Any]:
+        """Mongo document for this content; one codepath for every writer"""
+        return {
+            'id': doc_id or self.id,
+            'title': self.title,
+            'type': self.type,
+            'content': self.content,
+            'summary': self.summary,
+            'difficulty_level': self.difficulty_level,
+            'learning_style': self.learning_style,
+            'topic': self.topic,
+            'estimated_duration': self.estimated_duration,
+            'prerequisites': self.prerequisites,
+            'learning_objectives': self.learning_objectives,
+            'created_at': created_at,
+            'learner_id': learner_id,
+            'status': 'ready'
+        }
\ No newline at end of file
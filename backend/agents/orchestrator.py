@@ -1,226 +1,332 @@
-# agents/orchestrator.py
-import uuid
-import threading
-from datetime import datetime
-from typing import Dict, Any, List
-from dataclasses import asdict
-from .content_generator import ContentGeneratorAgent
-from .path_generator import PathGeneratorAgent
-from .evaluator import EvaluatorAgent
-from .models import LearnerProfile, LearningPath
-
-class AgentOrchestrator:
-    """Orchestrates all AI agents for coordinated learning experience"""
-    
-    def __init__(self, gemini_api_key: str):
-        self.content_agent = ContentGeneratorAgent(gemini_api_key)
-        self.path_agent = PathGeneratorAgent(gemini_api_key)
-        self.evaluator_agent = EvaluatorAgent(gemini_api_key)
-        print("✅ Initialized AI Agent Orchestrator with Gemini AI")
-    
-    def process_new_learner(self, profile_data: Dict, db) -> Dict[str, Any]:
-        # Ensure knowledge_level is an integer
-        knowledge_level = profile_data.get('knowledge_level', 1)
-        if isinstance(knowledge_level, str):
-            try:
-                knowledge_level = int(knowledge_level)
-            except (ValueError, TypeError):
-                knowledge_level = 1
-        
-        # Ensure weak_areas is a list
-        weak_areas = profile_data.get('weak_areas', [])
-        if not isinstance(weak_areas, list):
-            weak_areas = []
-        
-        # Create learner profile
-        profile = LearnerProfile(
-            id=str(uuid.uuid4()),
-            name=str(profile_data['name']),
-            learning_style=str(profile_data['learning_style']),
-            knowledge_level=knowledge_level,
-            subject=str(profile_data['subject']),
-            weak_areas=weak_areas,
-            created_at=datetime.utcnow()
-        )
-        
-        # Save profile to database
-        db.learner_profiles.insert_one(asdict(profile))
-        print(f"✅ Created learner profile: {profile.id}")
-        
-        # Create initial learning path with placeholder resources
-        initial_path_resources = self._create_initial_path(profile, db)
-        
-        # Create learning path
-        learning_path = LearningPath(
-            id=str(uuid.uuid4()),
-            learner_id=profile.id,
-            resources=initial_path_resources,
-            current_position=0,
-            progress={},
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-        
-        # Save learning path
-        db.learning_paths.insert_one(asdict(learning_path))
-        print(f"✅ Created initial learning path: {learning_path.id}")
-        
-        # Start background resource generation
-        self._start_background_generation(profile, db, learning_path.id)
-        
-        return {
-            'profile_id': profile.id,
-            'path_id': learning_path.id,
-            'initial_resources': initial_path_resources[:3],
-            'status': 'generating_content'
-        }
-    
-    def _create_initial_path(self, profile: LearnerProfile, db) -> List[str]:
-        """Create initial path with basic topics, detailed content will be generated later"""
-        
-        # Get topic sequence quickly
-        topics = self._get_quick_topics(profile.subject, profile.weak_areas)
-        
-        resource_ids = []
-        for i, topic in enumerate(topics[:5]):  # Limit to 5 topics initially
-            # Create basic resource entry
-            resource_id = str(uuid.uuid4())
-            basic_resource = {
-                'id': resource_id,
-                'title': f"{topic} - Introduction",
-                'type': 'lesson',
-                'content': f"Loading comprehensive content for {topic}...",
-                'summary': f"Learn the fundamentals of {topic}",
-                'difficulty_level': min(5, profile.knowledge_level + (i // 2)),
-                'learning_style': profile.learning_style,
-                'topic': topic,
-                'estimated_duration': 15,
-                'prerequisites': [],
-                'learning_objectives': [f"Understand {topic} concepts"],
-                'created_at': datetime.utcnow(),
-                'learner_id': profile.id,
-                'status': 'generating'  # Mark as being generated
-            }
-            
-            db.learning_resources.insert_one(basic_resource)
-            resource_ids.append(resource_id)
-        
-        return resource_ids
-    
-    def _get_quick_topics(self, subject: str, weak_areas: List[str]) -> List[str]:
-        """Get topic sequence quickly without AI generation"""
-        
-        topic_sequences = {
-            'algebra': [
-                'Variables and Expressions',
-                'Linear Equations', 
-                'Systems of Equations',
-                'Quadratic Functions',
-                'Polynomial Operations'
-            ],
-            'geometry': [
-                'Basic Shapes and Properties',
-                'Angles and Triangles',
-                'Area and Perimeter',
-                'Circle Geometry',
-                '3D Shapes and Volume'
-            ],
-            'trigonometry': [
-                'Introduction to Trigonometry',
-                'Sine, Cosine, and Tangent',
-                'Unit Circle',
-                'Trigonometric Identities',
-                'Applications of Trigonometry'
-            ],
-            'calculus': [
-                'Limits and Continuity',
-                'Introduction to Derivatives',
-                'Applications of Derivatives',
-                'Introduction to Integrals',
-                'Applications of Integration'
-            ]
-        }
-        
-        base_topics = topic_sequences.get(subject.lower(), topic_sequences['algebra'])
-        
-        # Prioritize weak areas
-        if weak_areas:
-            prioritized_topics = []
-            for weak_area in weak_areas:
-                for topic in base_topics:
-                    if weak_area.lower() in topic.lower() and topic not in prioritized_topics:
-                        prioritized_topics.append(topic)
-            
-            # Add remaining topics
-            for topic in base_topics:
-                if topic not in prioritized_topics:
-                    prioritized_topics.append(topic)
-            
-            return prioritized_topics[:5]
-        
-        return base_topics[:5]
-    
-    def _start_background_generation(self, profile: LearnerProfile, db, path_id: str):
-        """Start background thread to generate detailed content"""
-        
-        def generate_content():
-            try:
-                print(f"🚀 Starting background content generation for {profile.name}")
-                
-                # Get the basic resources
-                path = db.learning_paths.find_one({'id': path_id})
-                if not path:
-                    return
-                
-                resource_ids = path['resources']
-                
-                for resource_id in resource_ids:
-                    basic_resource = db.learning_resources.find_one({'id': resource_id})
-                    if basic_resource and basic_resource.get('status') == 'generating':
-                        
-                        print(f"📝 Generating content for: {basic_resource['title']}")
-                        
-                        # Generate detailed content
-                        detailed_content = self.path_agent.content_generator._generate_single_content(
-                            topic=basic_resource['topic'],
-                            resource_type=basic_resource['type'],
-                            difficulty=basic_resource['difficulty_level'],
-                            learning_style=basic_resource['learning_style'],
-                            sequence_position=resource_ids.index(resource_id) + 1,
-                            total_sequence=len(resource_ids)
-                        )
-                        
-                        if detailed_content:
-                            # Update the resource with generated content
-                            update_data = {
-                                'title': detailed_content.title,
-                                'content': detailed_content.content,
-                                'summary': detailed_content.summary,
-                                'learning_objectives': detailed_content.learning_objectives,
-                                'estimated_duration': detailed_content.estimated_duration,
-                                'status': 'ready',
-                                'updated_at': datetime.utcnow()
-                            }
-                            
-                            db.learning_resources.update_one(
-                                {'id': resource_id},
-                                {'$set': update_data}
-                            )
-                            
-                            print(f"✅ Updated resource: {detailed_content.title}")
-                        else:
-                            # Mark as ready even if generation failed
-                            db.learning_resources.update_one(
-                                {'id': resource_id},
-                                {'$set': {'status': 'ready', 'updated_at': datetime.utcnow()}}
-                            )
-                
-                print(f"🎉 Completed background generation for {profile.name}")
-                
-            except Exception as e:
-                print(f"❌ Error in background generation: {e}")
-        
-        # Start the background thread
-        thread = threading.Thread(target=generate_content)
-        thread.daemon = True
-        thread.start()
\ No newline at end of file
+# agents/orchestrator.py
+import asyncio
+import functools
+import logging
+import uuid
+import fastjsonschema
+from datetime import datetime
+from typing import Dict, Any, List
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from .content_generator import ContentGeneratorAgent, run_async, submit_async
+from .path_generator import PathGeneratorAgent
+from .evaluator import EvaluatorAgent
+from .models import LearnerProfile, LearningPath, shallow_asdict
+
+# Topic sequences per subject, built once at import. The parallel lowercased
+# table keeps the weak-area substring matching allocation-free per call
+_TOPIC_SEQUENCES = {
+    'algebra': (
+        'Variables and Expressions',
+        'Linear Equations',
+        'Systems of Equations',
+        'Quadratic Functions',
+        'Polynomial Operations'
+    ),
+    'geometry': (
+        'Basic Shapes and Properties',
+        'Angles and Triangles',
+        'Area and Perimeter',
+        'Circle Geometry',
+        '3D Shapes and Volume'
+    ),
+    'trigonometry': (
+        'Introduction to Trigonometry',
+        'Sine, Cosine, and Tangent',
+        'Unit Circle',
+        'Trigonometric Identities',
+        'Applications of Trigonometry'
+    ),
+    'calculus': (
+        'Limits and Continuity',
+        'Introduction to Derivatives',
+        'Applications of Derivatives',
+        'Introduction to Integrals',
+        'Applications of Integration'
+    )
+}
+log = logging.getLogger(__name__)
+
+# Compiled once at import, mirroring the quiz validator in
+# content_generator: one call checks required fields and types and fills
+# defaults, replacing per-field isinstance checks on every signup
+_PROFILE_VALIDATOR = fastjsonschema.compile({
+    "type": "object",
+    "required": ["name", "learning_style", "subject"],
+    "properties": {
+        "name": {"type": "string"},
+        "learning_style": {"type": "string"},
+        "subject": {"type": "string"},
+        "knowledge_level": {"type": "integer", "minimum": 1, "maximum": 5, "default": 1},
+        "weak_areas": {"type": "array", "items": {"type": "string"}, "default": []}
+    }
+})
+
+def _normalize_profile_data(profile_data: Dict) -> Dict:
+    """Coerce legacy client quirks, then validate with the compiled schema"""
+    data = dict(profile_data)
+    # Forms historically send knowledge_level as a string; keep accepting it
+    knowledge_level = data.get('knowledge_level', 1)
+    if isinstance(knowledge_level, str):
+        try:
+            knowledge_level = int(knowledge_level)
+        except ValueError:
+            knowledge_level = 1
+    data['knowledge_level'] = knowledge_level if isinstance(knowledge_level, int) else 1
+    if not isinstance(data.get('weak_areas', []), list):
+        data['weak_areas'] = []
+    return _PROFILE_VALIDATOR(data)
+
+_TOPIC_SEQUENCES_LC = {
+    subject: tuple(topic.lower() for topic in topics)
+    for subject, topics in _TOPIC_SEQUENCES.items()
+}
+
+@functools.lru_cache(maxsize=512)
+def _quick_topics(subject_key: str, weak_areas_lc: tuple) -> tuple:
+    """Resolve the prioritized topic sequence for a subject and weak areas
+
+    Pure in its arguments, and signups repeat the same (subject, weak areas)
+    combinations constantly, so the memoized hit path is a single dict probe.
+    Module-level so lru_cache doesn't pin orchestrator instances.
+    """
+    if subject_key not in _TOPIC_SEQUENCES:
+        subject_key = 'algebra'
+    base_topics = _TOPIC_SEQUENCES[subject_key]
+    base_topics_lc = _TOPIC_SEQUENCES_LC[subject_key]
+
+    # Prioritize weak areas; dict keys act as an ordered set so the
+    # dedup check is O(1) instead of a list scan
+    if weak_areas_lc:
+        prioritized = {}
+        for weak_lc in weak_areas_lc:
+            for topic, topic_lc in zip(base_topics, base_topics_lc):
+                if weak_lc in topic_lc:
+                    prioritized[topic] = None
+
+        # Add remaining topics
+        for topic in base_topics:
+            prioritized.setdefault(topic, None)
+
+        return tuple(prioritized)[:5]
+
+    return base_topics[:5]
+
+def _log_background_result(future):
+    exc = future.exception()
+    if exc is not None:
+        log.error("Error in background generation: %s", exc)
+
+class AgentOrchestrator:
+    """Orchestrates all AI agents for coordinated learning experience"""
+    
+    def __init__(self, gemini_api_key: str):
+        self.content_agent = ContentGeneratorAgent(gemini_api_key)
+        self.path_agent = PathGeneratorAgent(gemini_api_key)
+        self.evaluator_agent = EvaluatorAgent(gemini_api_key)
+        log.info("Initialized AI Agent Orchestrator with Gemini AI")
+    
+    def process_new_learner(self, profile_data: Dict, db) -> Dict[str, Any]:
+        """Create profile, initial path and placeholders (sync wrapper)"""
+        return run_async(self.process_new_learner_async(profile_data, db))
+
+    async def process_new_learner_async(self, profile_data: Dict, db) -> Dict[str, Any]:
+        data = _normalize_profile_data(profile_data)
+        now = datetime.utcnow()
+
+        # Create learner profile
+        profile = LearnerProfile(
+            id=uuid.uuid4().hex,
+            name=data['name'],
+            learning_style=data['learning_style'],
+            knowledge_level=data['knowledge_level'],
+            subject=data['subject'],
+            weak_areas=data['weak_areas'],
+            created_at=now
+        )
+        
+        # The profile insert and the placeholder-resource bulk insert don't
+        # depend on each other, so overlap their round-trips in worker
+        # threads; only the path insert below has to wait for the resources
+        _, (initial_resource_ids, initial_resources) = await asyncio.gather(
+            asyncio.to_thread(db.learner_profiles.insert_one, shallow_asdict(profile)),
+            asyncio.to_thread(self._create_initial_path, profile, db, now)
+        )
+        log.info("Created learner profile: %s", profile.id)
+
+        # Create learning path
+        learning_path = LearningPath(
+            id=uuid.uuid4().hex,
+            learner_id=profile.id,
+            resources=initial_resource_ids,
+            current_position=0,
+            progress={},
+            created_at=now,
+            updated_at=now
+        )
+        
+        # Save learning path
+        await asyncio.to_thread(db.learning_paths.insert_one, shallow_asdict(learning_path))
+        log.info("Created initial learning path: %s", learning_path.id)
+        
+        # Start background resource generation
+        self._start_background_generation(profile, db, learning_path.id)
+        
+        # Return the placeholder documents themselves (minus Mongo's _id,
+        # added in place by insert_many) so the client can render the full
+        # path without issuing a follow-up read per resource
+        return {
+            'profile_id': profile.id,
+            'path_id': learning_path.id,
+            'initial_resources': [
+                {k: v for k, v in resource.items() if k != '_id'}
+                for resource in initial_resources
+            ],
+            'status': 'generating_content'
+        }
+    
+    def _create_initial_path(self, profile: LearnerProfile, db, now: datetime):
+        """Create initial path with basic topics, detailed content will be generated later"""
+        
+        # Get topic sequence quickly
+        topics = self._get_quick_topics(profile.subject, profile.weak_areas)
+        
+        resource_ids = []
+        basic_resources = []
+        for i, topic in enumerate(topics[:5]):  # Limit to 5 topics initially
+            # Create basic resource entry
+            resource_id = uuid.uuid4().hex
+            basic_resource = {
+                'id': resource_id,
+                'title': f"{topic} - Introduction",
+                'type': 'lesson',
+                'content': f"Loading comprehensive content for {topic}...",
+                'summary': f"Learn the fundamentals of {topic}",
+                'difficulty_level': min(5, profile.knowledge_level + (i // 2)),
+                'learning_style': profile.learning_style,
+                'topic': topic,
+                'estimated_duration': 15,
+                'prerequisites': [],
+                'learning_objectives': [f"Understand {topic} concepts"],
+                'created_at': now,
+                'learner_id': profile.id,
+                'status': 'generating'  # Mark as being generated
+            }
+            
+            basic_resources.append(basic_resource)
+            resource_ids.append(resource_id)
+
+        # One bulk round-trip instead of one insert per placeholder;
+        # unordered so a single bad document doesn't block the rest
+        if basic_resources:
+            try:
+                db.learning_resources.insert_many(basic_resources, ordered=False)
+            except BulkWriteError as e:
+                log.error("Partial failure inserting placeholder resources: %s", e.details)
+
+        return resource_ids, basic_resources
+    
+    def _get_quick_topics(self, subject: str, weak_areas: List[str]) -> List[str]:
+        """Get topic sequence quickly without AI generation"""
+        weak_areas_lc = tuple(wa.lower() for wa in weak_areas) if weak_areas else ()
+        return list(_quick_topics(subject.lower(), weak_areas_lc))
+    
+    def _start_background_generation(self, profile: LearnerProfile, db, path_id: str):
+        """Schedule detailed content generation on the shared agent loop"""
+        future = submit_async(self._generate_path_content(profile, db, path_id))
+        future.add_done_callback(_log_background_result)
+
+    async def _generate_path_content(self, profile: LearnerProfile, db, path_id: str):
+        """Generate detailed content for every placeholder in a path
+
+        Runs on the shared agent loop: the LLM calls are native coroutines
+        gathered concurrently, and pymongo calls are pushed to worker
+        threads so they never block the loop.
+        """
+        log.info("Starting background content generation for %s", profile.name)
+
+        path = await asyncio.to_thread(db.learning_paths.find_one, {'id': path_id})
+        if not path:
+            return
+
+        resource_ids = path['resources']
+
+        # One $in query with a narrow projection instead of a find_one per
+        # resource; the status filter happens server-side
+        cursor = db.learning_resources.find(
+            {'id': {'$in': resource_ids}, 'status': 'generating'},
+            {'id': 1, 'title': 1, 'type': 1, 'difficulty_level': 1,
+             'learning_style': 1, 'topic': 1}
+        )
+        basics = {r['id']: r for r in await asyncio.to_thread(list, cursor)}
+
+        to_generate = []
+        for i, resource_id in enumerate(resource_ids):
+            basic_resource = basics.get(resource_id)
+            if basic_resource:
+                to_generate.append((resource_id, basic_resource, i + 1))
+
+        if not to_generate:
+            return
+
+        generator = self.path_agent.content_generator
+
+        async def generate_one(resource_id, basic, position):
+            log.info("Generating content for: %s", basic['title'])
+            try:
+                content = await generator._generate_single_content_async(
+                    topic=basic['topic'],
+                    resource_type=basic['type'],
+                    difficulty=basic['difficulty_level'],
+                    learning_style=basic['learning_style'],
+                    sequence_position=position,
+                    total_sequence=len(resource_ids)
+                )
+            except Exception as e:
+                log.warning("Generation failed for %s: %s", resource_id, e)
+                content = None
+            return resource_id, content
+
+        async def flush_ops(pending_ops):
+            if pending_ops:
+                try:
+                    await asyncio.to_thread(
+                        db.learning_resources.bulk_write, pending_ops, ordered=False
+                    )
+                except BulkWriteError as e:
+                    log.error("Partial failure writing resource updates: %s", e.details)
+                pending_ops.clear()
+
+        # Pipeline the stages: consume completions as they land and flush
+        # update batches while the remaining LLM calls are still in flight,
+        # so DB writes overlap generation instead of waiting for the
+        # slowest resource
+        pending_ops = []
+        for finished in asyncio.as_completed([
+            generate_one(rid, basic, position)
+            for rid, basic, position in to_generate
+        ]):
+            resource_id, detailed_content = await finished
+
+            if detailed_content:
+                # Update the resource with generated content
+                update_data = {
+                    'title': detailed_content.title,
+                    'content': detailed_content.content,
+                    'summary': detailed_content.summary,
+                    'learning_objectives': list(detailed_content.learning_objectives),
+                    'estimated_duration': detailed_content.estimated_duration,
+                    'status': 'ready',
+                    'updated_at': datetime.utcnow()
+                }
+                log.info("Generated resource: %s", detailed_content.title)
+            else:
+                # Mark as ready even if generation failed
+                update_data = {'status': 'ready', 'updated_at': datetime.utcnow()}
+
+            pending_ops.append(UpdateOne({'id': resource_id}, {'$set': update_data}))
+            if len(pending_ops) >= 5:
+                await flush_ops(pending_ops)
+
+        await flush_ops(pending_ops)
+        log.info("Completed background generation for %s", profile.name)
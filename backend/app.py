@@ -1,449 +1,607 @@
-# app.py
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import os
-from pymongo import MongoClient
-from datetime import datetime
-import uuid
-from dataclasses import asdict
-from dotenv import load_dotenv
-
-# Import agents
-from agents import (
-    AgentOrchestrator, 
-    ContentGeneratorAgent, 
-    EvaluatorAgent,
-    LearnerProfile, 
-    LearningResource,
-    QuizQuestion
-)
-
-# Load environment variables
-load_dotenv()
-
-app = Flask(__name__)
-CORS(app, supports_credentials=True, origins=["http://localhost:3000"])
-app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-here')
-
-# Gemini AI configuration
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-
-if not GEMINI_API_KEY:
-    print("❌ GEMINI_API_KEY not found in environment variables!")
-    print("Please set your Gemini API key in .env file")
-else:
-    print(f"🤖 Using Gemini AI with API key: {GEMINI_API_KEY[:10]}...")
-
-# Database configuration
-client = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))
-db = client.personalized_tutor
-
-def clean_mongo_doc(doc):
-    if doc and '_id' in doc:
-        del doc['_id']
-    return doc
-
-# Initialize orchestrator
-orchestrator = AgentOrchestrator(GEMINI_API_KEY)
-
-# Routes without authentication
-@app.route('/api/learner/create', methods=['POST'])
-def create_learner():
-    try:
-        data = request.get_json()
-        print(f"🏗️ Creating learner profile")
-        
-        result = orchestrator.process_new_learner(data, db)
-        
-        return jsonify({'success': True, 'data': result})
-    except Exception as e:
-        print(f"❌ Error creating learner: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/learner/<learner_id>/pretest', methods=['POST'])
-def conduct_pretest(learner_id):
-    try:
-        data = request.get_json()
-        subject = data.get('subject', 'algebra')
-        
-        print(f"🧪 Conducting pretest for learner: {learner_id}, subject: {subject}")
-        
-        # Generate questions using content generator
-        questions = orchestrator.content_agent.generate_quiz_questions(
-            topic=subject,
-            difficulty=2,  # Medium difficulty for pretest
-            count=5
-        )
-        
-        # Create pretest record
-        pretest_id = str(uuid.uuid4())
-        pretest_doc = {
-            'id': pretest_id,
-            'learner_id': learner_id,
-            'subject': subject,
-            'questions': [asdict(q) for q in questions],
-            'created_at': datetime.utcnow(),
-            'status': 'active'
-        }
-        
-        db.pretests.insert_one(pretest_doc)
-        
-        return jsonify({
-            'success': True,
-            'pretest_id': pretest_id,
-            'questions': [asdict(q) for q in questions]
-        })
-        
-    except Exception as e:
-        print(f"❌ Error conducting pretest: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/pretest/<pretest_id>/submit', methods=['POST'])
-def submit_pretest(pretest_id):
-    try:
-        data = request.get_json()
-        answers = data.get('answers', {})
-        
-        print(f"📝 Submitting pretest: {pretest_id}")
-        
-        # Get pretest
-        pretest = db.pretests.find_one({'id': pretest_id})
-        if not pretest:
-            return jsonify({'success': False, 'error': 'Pretest not found'}), 404
-        
-        # Evaluate answers
-        results = []
-        for question in pretest['questions']:
-            user_answer = answers.get(question['id'], '')
-            is_correct = user_answer.strip().lower() == question['correct_answer'].strip().lower()
-            
-            result = orchestrator.evaluator_agent.evaluate_quiz_response(
-                QuizQuestion(**question),
-                user_answer
-            )
-            results.append(result)
-        
-        # Generate overall feedback
-        overall_feedback = orchestrator.evaluator_agent.generate_overall_feedback(results)
-        
-        # Update pretest with results
-        db.pretests.update_one(
-            {'id': pretest_id},
-            {'$set': {
-                'answers': answers,
-                'results': results,
-                'overall_feedback': overall_feedback,
-                'completed_at': datetime.utcnow(),
-                'status': 'completed'
-            }}
-        )
-        
-        return jsonify({
-            'success': True,
-            'results': results,
-            'overall_feedback': overall_feedback
-        })
-        
-    except Exception as e:
-        print(f"❌ Error submitting pretest: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/learner/<learner_id>/path', methods=['GET'])
-def get_learning_path(learner_id):
-    try:
-        print(f"🛤️ Getting learning path for learner: {learner_id}")
-        
-        # Get learner profile
-        learner_profile = db.learner_profiles.find_one({'id': learner_id})
-        if not learner_profile:
-            return jsonify({'success': False, 'error': 'Learner profile not found'}), 404
-        
-        # Get learning path
-        learning_path = db.learning_paths.find_one({'learner_id': learner_id})
-        if not learning_path:
-            return jsonify({'success': False, 'error': 'Learning path not found'}), 404
-        
-        # Get current resource
-        current_resource = None
-        if learning_path['current_position'] < len(learning_path['resources']):
-            current_resource_id = learning_path['resources'][learning_path['current_position']]
-            current_resource = db.learning_resources.find_one({'id': current_resource_id}, {'_id': 0})
-        
-        # Calculate progress
-        total_resources = len(learning_path['resources'])
-        completed_resources = learning_path['current_position']
-        completion_percentage = (completed_resources / total_resources * 100) if total_resources > 0 else 0
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'learner_id': learner_id,
-                'current_position': learning_path['current_position'],
-                'total_resources': total_resources,
-                'completed_resources': completed_resources,
-                'completion_percentage': completion_percentage,
-                'current_resource': current_resource,
-                'all_resources': learning_path['resources'],
-                'progress': learning_path.get('progress', {})
-            }
-        })
-        
-    except Exception as e:
-        print(f"❌ Error getting learning path: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/resource/<resource_id>', methods=['GET'])
-def get_resource(resource_id):
-    try:
-        print(f"📚 Getting resource: {resource_id}")
-        
-        resource = db.learning_resources.find_one({'id': resource_id}, {'_id': 0})
-        if not resource:
-            return jsonify({'success': False, 'error': 'Resource not found'}), 404
-        
-        return jsonify({
-            'success': True,
-            'data': resource
-        })
-        
-    except Exception as e:
-        print(f"❌ Error getting resource: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/resource/<resource_id>/quiz', methods=['GET'])
-def get_resource_quiz(resource_id):
-    try:
-        print(f"📝 Getting quiz for resource: {resource_id}")
-        
-        # Get resource
-        resource = db.learning_resources.find_one({'id': resource_id})
-        if not resource:
-            return jsonify({'success': False, 'error': 'Resource not found'}), 404
-        
-        # Generate quiz questions
-        questions = orchestrator.content_agent.generate_quiz_questions(
-            topic=resource['topic'],
-            difficulty=resource['difficulty_level'],
-            count=3
-        )
-        
-        # Create quiz record
-        quiz_id = str(uuid.uuid4())
-        quiz_doc = {
-            'id': quiz_id,
-            'resource_id': resource_id,
-            'questions': [asdict(q) for q in questions],
-            'created_at': datetime.utcnow(),
-            'status': 'active'
-        }
-        
-        db.quizzes.insert_one(quiz_doc)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'quiz_id': quiz_id,
-                'questions': [asdict(q) for q in questions]
-            }
-        })
-        
-    except Exception as e:
-        print(f"❌ Error getting resource quiz: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/quiz/<quiz_id>/submit', methods=['POST'])
-def submit_quiz(quiz_id):
-    try:
-        data = request.get_json()
-        learner_id = data.get('learner_id')
-        answers = data.get('answers', {})
-        
-        print(f"📝 Submitting quiz: {quiz_id} for learner: {learner_id}")
-        
-        # Get quiz
-        quiz = db.quizzes.find_one({'id': quiz_id})
-        if not quiz:
-            return jsonify({'success': False, 'error': 'Quiz not found'}), 404
-        
-        # Evaluate answers
-        results = []
-        for question in quiz['questions']:
-            user_answer = answers.get(question['id'], '')
-            is_correct = user_answer.strip().lower() == question['correct_answer'].strip().lower()
-            
-            result = orchestrator.evaluator_agent.evaluate_quiz_response(
-                QuizQuestion(**question),
-                user_answer
-            )
-            results.append(result)
-        
-        # Generate overall feedback
-        overall_feedback = orchestrator.evaluator_agent.generate_overall_feedback(results)
-        
-        # Save quiz submission
-        submission_doc = {
-            'id': str(uuid.uuid4()),
-            'quiz_id': quiz_id,
-            'learner_id': learner_id,
-            'answers': answers,
-            'results': results,
-            'overall_feedback': overall_feedback,
-            'submitted_at': datetime.utcnow()
-        }
-        
-        db.quiz_submissions.insert_one(submission_doc)
-        
-        # Update learning path progress if score is good
-        if overall_feedback.get('average_score', 0) >= 60:
-            learning_path = db.learning_paths.find_one({'learner_id': learner_id})
-            if learning_path:
-                new_position = min(learning_path['current_position'] + 1, len(learning_path['resources']))
-                db.learning_paths.update_one(
-                    {'learner_id': learner_id},
-                    {'$set': {
-                        'current_position': new_position,
-                        f'progress.{quiz["resource_id"]}': overall_feedback,
-                        'updated_at': datetime.utcnow()
-                    }}
-                )
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'results': results,
-                'overall_feedback': overall_feedback
-            }
-        })
-        
-    except Exception as e:
-        print(f"❌ Error submitting quiz: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/learner/<learner_id>/progress', methods=['GET'])
-def get_learner_progress(learner_id):
-    try:
-        print(f"📊 Getting progress for learner: {learner_id}")
-        
-        # Get learner profile
-        learner_profile = db.learner_profiles.find_one({'id': learner_id}, {'_id': 0})
-        if not learner_profile:
-            return jsonify({'success': False, 'error': 'Learner profile not found'}), 404
-        
-        # Get learning path
-        learning_path = db.learning_paths.find_one({'learner_id': learner_id}, {'_id': 0})
-        if not learning_path:
-            return jsonify({'success': False, 'error': 'Learning path not found'}), 404
-        
-        # Calculate progress metrics
-        total_resources = len(learning_path['resources'])
-        completed_resources = learning_path['current_position']
-        completion_percentage = (completed_resources / total_resources * 100) if total_resources > 0 else 0
-        
-        progress_data = {
-            'learner_profile': learner_profile,
-            'learning_path': {
-                'total_resources': total_resources,
-                'completed_resources': completed_resources,
-                'completion_percentage': completion_percentage,
-                'current_position': learning_path['current_position']
-            },
-            'progress_details': learning_path.get('progress', {})
-        }
-        
-        return jsonify({
-            'success': True,
-            'data': progress_data
-        })
-        
-    except Exception as e:
-        print(f"❌ Error getting learner progress: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/analytics/dashboard', methods=['GET'])
-def get_analytics_dashboard():
-    try:
-        print(f"📈 Getting analytics dashboard")
-        
-        # Get total learners
-        total_learners = db.learner_profiles.count_documents({})
-        
-        # Get total learning paths
-        total_paths = db.learning_paths.count_documents({})
-        
-        # Get total quizzes
-        total_quizzes = db.quiz_submissions.count_documents({})
-        
-        # Calculate average completion rate
-        paths = list(db.learning_paths.find({}, {'current_position': 1, 'resources': 1}))
-        completion_rates = []
-        for path in paths:
-            if len(path['resources']) > 0:
-                rate = (path['current_position'] / len(path['resources'])) * 100
-                completion_rates.append(rate)
-        
-        avg_completion = sum(completion_rates) / len(completion_rates) if completion_rates else 0
-        
-        # Get learning styles distribution
-        learning_styles = list(db.learner_profiles.aggregate([
-            {'$group': {'_id': '$learning_style', 'count': {'$sum': 1}}}
-        ]))
-        
-        analytics = {
-            'total_learners': total_learners,
-            'total_paths': total_paths,
-            'total_quizzes': total_quizzes,
-            'average_completion_rate': avg_completion,
-            'learning_styles_distribution': learning_styles
-        }
-        
-        return jsonify({
-            'success': True,
-            'analytics': analytics
-        })
-        
-    except Exception as e:
-        print(f"❌ Error getting analytics: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-# Health check
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    gemini_status = test_gemini_connection()
-    return jsonify({
-        'status': 'healthy', 
-        'timestamp': datetime.utcnow().isoformat(),
-        'gemini_connected': gemini_status,
-        'ai_model': 'gemini-2.0-flash-exp',
-        'auth_enabled': False,
-        'public_access': True
-    })
-
-def test_gemini_connection():
-    try:
-        if not GEMINI_API_KEY:
-            print("❌ Gemini API key not configured")
-            return False
-            
-        from agents.content_generator import GeminiClient
-        gemini = GeminiClient(GEMINI_API_KEY)
-        response = gemini.generate("Test prompt: Say hello", max_tokens=10)
-        print(f"✅ Gemini AI connection successful")
-        return True
-    except Exception as e:
-        print(f"❌ Gemini AI connection failed: {e}")
-        print("Make sure your GEMINI_API_KEY is correctly set in .env file")
-        return False
-
-if __name__ == '__main__':
-    print("🤖 Starting Personalized Tutor API (No Authentication)")
-    
-    # Test Gemini connection
-    if test_gemini_connection():
-        print("✅ Ready to serve requests!")
-    else:
-        print("⚠️ Gemini AI connection issues detected, but server will start anyway")
-        print("Make sure to set GEMINI_API_KEY in your .env file")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+# app.py
+import orjson
+from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
+from flask_cors import CORS
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import MongoClient
+from datetime import datetime
+import uuid
+from dotenv import load_dotenv
+
+# Import agents
+from agents import (
+    AgentOrchestrator, 
+    ContentGeneratorAgent, 
+    EvaluatorAgent,
+    LearnerProfile, 
+    LearningResource,
+    shallow_asdict,
+    run_async
+)
+
+# Load environment variables
+load_dotenv()
+
+# Handlers hang off a queue so request threads never block on stderr I/O;
+# a single listener thread does the actual writing. The QueueHandler goes on
+# the root logger bare — giving it a formatter (as basicConfig would) bakes
+# one rendering into the record before the listener formats it again
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logger = logging.getLogger(__name__)
+
+class ORJSONProvider(JSONProvider):
+    """orjson-backed JSON for every jsonify/get_json call
+
+    Responses are dominated by large generated-content payloads, and
+    orjson serializes them several times faster than the stdlib encoder.
+    It also handles the datetimes in Mongo documents natively.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app = Flask(__name__)
+app.json = ORJSONProvider(app)
+CORS(app, supports_credentials=True, origins=["http://localhost:3000"])
+app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-here')
+
+# Gemini AI configuration
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+
+if not GEMINI_API_KEY:
+    logger.error("GEMINI_API_KEY not found in environment variables! "
+                 "Please set your Gemini API key in .env file")
+else:
+    logger.info("Using Gemini AI with API key: %s...", GEMINI_API_KEY[:10])
+
+# Database configuration
+# Explicit pool bounds: threaded Flask plus the background generation
+# loop can hold many sockets at once, and keeping a few warm connections
+# avoids handshake latency on the first requests after idle
+client = MongoClient(
+    os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'),
+    maxPoolSize=100,
+    minPoolSize=10,
+    # Generated lesson bodies are large text blobs; wire compression
+    # shrinks those round-trips. zlib ships with the stdlib, so it needs
+    # no extra dependency, and the driver falls back to uncompressed if
+    # the server doesn't advertise it
+    compressors='zlib',
+)
+db = client.personalized_tutor
+
+# Every agent query filters on the UUID string 'id', not Mongo's _id;
+# without these indexes each lookup is a collection scan. create_index is
+# a no-op when the index already exists. Each index gets its own guard so
+# one bad collection (e.g. legacy duplicates tripping a unique index)
+# doesn't abort creation of the rest.
+def _ensure_index(collection, keys, **kwargs):
+    try:
+        collection.create_index(keys, **kwargs)
+    except Exception as e:
+        logger.warning("Could not ensure index %s on %s: %s", keys, collection.name, e)
+
+_ensure_index(db.learner_profiles, 'id', unique=True)
+_ensure_index(db.learning_paths, 'id', unique=True)
+# Path and progress routes look paths up by learner
+_ensure_index(db.learning_paths, 'learner_id', unique=True)
+_ensure_index(db.learning_resources, 'id', unique=True)
+# Downstream readers filter resources by learner, status and topic
+_ensure_index(db.learning_resources, [('learner_id', 1), ('status', 1), ('topic', 1)])
+_ensure_index(db.pretests, 'id', unique=True)
+_ensure_index(db.quizzes, 'id', unique=True)
+# Per-learner submission history, newest first
+_ensure_index(db.quiz_submissions, [('learner_id', 1), ('submitted_at', -1)])
+
+# Small pool for writes the response doesn't depend on
+_deferred_writes = ThreadPoolExecutor(max_workers=2, thread_name_prefix='deferred-write')
+
+def _log_deferred_write_result(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Deferred write failed: %s", exc)
+
+def clean_mongo_doc(doc):
+    if doc and '_id' in doc:
+        del doc['_id']
+    return doc
+
+# Initialize orchestrator
+orchestrator = AgentOrchestrator(GEMINI_API_KEY)
+
+# Routes without authentication
+@app.route('/api/learner/create', methods=['POST'])
+def create_learner():
+    try:
+        data = request.get_json()
+        logger.info("Creating learner profile")
+        
+        result = orchestrator.process_new_learner(data, db)
+        
+        return jsonify({'success': True, 'data': result})
+    except Exception as e:
+        logger.exception("Error creating learner")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/learner/<learner_id>/pretest', methods=['POST'])
+def conduct_pretest(learner_id):
+    try:
+        data = request.get_json()
+        subject = data.get('subject', 'algebra')
+        
+        logger.info("Conducting pretest for learner: %s, subject: %s", learner_id, subject)
+        
+        # Generate questions using content generator
+        questions = run_async(orchestrator.content_agent.generate_quiz_questions(
+            topic=subject,
+            difficulty=2,  # Medium difficulty for pretest
+            count=5
+        ))
+        
+        # Create pretest record; shallow_asdict skips asdict's deep copy
+        # and the same dicts serve both the insert and the response
+        question_docs = [shallow_asdict(q) for q in questions]
+        pretest_id = str(uuid.uuid4())
+        pretest_doc = {
+            'id': pretest_id,
+            'learner_id': learner_id,
+            'subject': subject,
+            'questions': question_docs,
+            'created_at': datetime.utcnow(),
+            'status': 'active'
+        }
+        
+        # The response doesn't need the insert result, and the learner
+        # answers for minutes before the submit route reads this document
+        # back — fire the write in the background and return immediately
+        _deferred_writes.submit(
+            db.pretests.insert_one, pretest_doc
+        ).add_done_callback(_log_deferred_write_result)
+        
+        return jsonify({
+            'success': True,
+            'pretest_id': pretest_id,
+            'questions': question_docs
+        })
+        
+    except Exception as e:
+        logger.exception("Error conducting pretest")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/pretest/<pretest_id>/submit', methods=['POST'])
+def submit_pretest(pretest_id):
+    try:
+        data = request.get_json()
+        answers = data.get('answers', {})
+        
+        logger.info("Submitting pretest: %s", pretest_id)
+        
+        # Get pretest; only the questions are read below
+        pretest = db.pretests.find_one({'id': pretest_id}, {'_id': 0, 'questions': 1})
+        if not pretest:
+            return jsonify({'success': False, 'error': 'Pretest not found'}), 404
+        
+        # The stored question documents go straight to the evaluator; no
+        # need to rehydrate QuizQuestion objects per submission
+        pairs = [
+            (question, answers.get(question['id'], ''))
+            for question in pretest['questions']
+        ]
+        results, overall_feedback = run_async(
+            orchestrator.evaluator_agent.evaluate_quiz_batch(pairs)
+        )
+
+        # Update pretest with results
+        db.pretests.update_one(
+            {'id': pretest_id},
+            {'$set': {
+                'answers': answers,
+                'results': results,
+                'overall_feedback': overall_feedback,
+                'completed_at': datetime.utcnow(),
+                'status': 'completed'
+            }}
+        )
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'overall_feedback': overall_feedback
+        })
+        
+    except Exception as e:
+        logger.exception("Error submitting pretest")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/learner/<learner_id>/path', methods=['GET'])
+def get_learning_path(learner_id):
+    try:
+        logger.info("Getting learning path for learner: %s", learner_id)
+        
+        # Existence check only — project the id rather than pull the doc
+        learner_profile = db.learner_profiles.find_one({'id': learner_id}, {'id': 1})
+        if not learner_profile:
+            return jsonify({'success': False, 'error': 'Learner profile not found'}), 404
+        
+        # Get learning path
+        learning_path = db.learning_paths.find_one({'learner_id': learner_id})
+        if not learning_path:
+            return jsonify({'success': False, 'error': 'Learning path not found'}), 404
+        
+        # Get current resource
+        current_resource = None
+        if learning_path['current_position'] < len(learning_path['resources']):
+            current_resource_id = learning_path['resources'][learning_path['current_position']]
+            current_resource = db.learning_resources.find_one({'id': current_resource_id}, {'_id': 0})
+        
+        # Calculate progress
+        total_resources = len(learning_path['resources'])
+        completed_resources = learning_path['current_position']
+        completion_percentage = (completed_resources / total_resources * 100) if total_resources > 0 else 0
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'learner_id': learner_id,
+                'current_position': learning_path['current_position'],
+                'total_resources': total_resources,
+                'completed_resources': completed_resources,
+                'completion_percentage': completion_percentage,
+                'current_resource': current_resource,
+                'all_resources': learning_path['resources'],
+                'progress': learning_path.get('progress', {})
+            }
+        })
+        
+    except Exception as e:
+        logger.exception("Error getting learning path")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/resource/<resource_id>', methods=['GET'])
+def get_resource(resource_id):
+    try:
+        logger.info("Getting resource: %s", resource_id)
+        
+        resource = db.learning_resources.find_one({'id': resource_id}, {'_id': 0})
+        if not resource:
+            return jsonify({'success': False, 'error': 'Resource not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'data': resource
+        })
+        
+    except Exception as e:
+        logger.exception("Error getting resource")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/resource/<resource_id>/quiz', methods=['GET'])
+def get_resource_quiz(resource_id):
+    try:
+        logger.info("Getting quiz for resource: %s", resource_id)
+        
+        # Only the topic and difficulty feed the quiz prompt; skip the
+        # full content body
+        resource = db.learning_resources.find_one(
+            {'id': resource_id}, {'_id': 0, 'topic': 1, 'difficulty_level': 1}
+        )
+        if not resource:
+            return jsonify({'success': False, 'error': 'Resource not found'}), 404
+        
+        # Generate quiz questions
+        questions = run_async(orchestrator.content_agent.generate_quiz_questions(
+            topic=resource['topic'],
+            difficulty=resource['difficulty_level'],
+            count=3
+        ))
+        
+        # Create quiz record; one shallow conversion feeds both the insert
+        # and the response
+        question_docs = [shallow_asdict(q) for q in questions]
+        quiz_id = str(uuid.uuid4())
+        quiz_doc = {
+            'id': quiz_id,
+            'resource_id': resource_id,
+            'questions': question_docs,
+            'created_at': datetime.utcnow(),
+            'status': 'active'
+        }
+        
+        db.quizzes.insert_one(quiz_doc)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'quiz_id': quiz_id,
+                'questions': question_docs
+            }
+        })
+        
+    except Exception as e:
+        logger.exception("Error getting resource quiz")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/quiz/<quiz_id>/submit', methods=['POST'])
+def submit_quiz(quiz_id):
+    try:
+        data = request.get_json()
+        learner_id = data.get('learner_id')
+        answers = data.get('answers', {})
+        
+        logger.info("Submitting quiz: %s for learner: %s", quiz_id, learner_id)
+        
+        # Get quiz; evaluation needs the questions and resource_id only
+        quiz = db.quizzes.find_one(
+            {'id': quiz_id}, {'_id': 0, 'questions': 1, 'resource_id': 1}
+        )
+        if not quiz:
+            return jsonify({'success': False, 'error': 'Quiz not found'}), 404
+        
+        # Stored question documents go straight to the evaluator
+        pairs = [
+            (question, answers.get(question['id'], ''))
+            for question in quiz['questions']
+        ]
+
+        def advance_path(overall_feedback):
+            # Update learning path progress if score is good. One atomic
+            # pipeline update replaces the find_one + update_one pair: the
+            # position clamp is computed server-side, which halves the
+            # round-trips and can't race a concurrent submission
+            if overall_feedback.get('average_score', 0) >= 60:
+                db.learning_paths.update_one(
+                    {'learner_id': learner_id},
+                    [{'$set': {
+                        'current_position': {'$min': [
+                            {'$add': ['$current_position', 1]},
+                            {'$size': '$resources'}
+                        ]},
+                        f'progress.{quiz["resource_id"]}': {'$literal': overall_feedback},
+                        'updated_at': {'$literal': datetime.utcnow()}
+                    }}]
+                )
+
+        async def evaluate_and_store():
+            results, overall_feedback = await orchestrator.evaluator_agent.evaluate_quiz_batch(pairs)
+
+            submission_doc = {
+                'id': str(uuid.uuid4()),
+                'quiz_id': quiz_id,
+                'learner_id': learner_id,
+                'answers': answers,
+                'results': results,
+                'overall_feedback': overall_feedback,
+                'submitted_at': datetime.utcnow()
+            }
+
+            # The submission insert and the path-progress update are
+            # independent; overlap their round-trips instead of running
+            # them back to back
+            await asyncio.gather(
+                asyncio.to_thread(db.quiz_submissions.insert_one, submission_doc),
+                asyncio.to_thread(advance_path, overall_feedback)
+            )
+            return results, overall_feedback
+
+        results, overall_feedback = run_async(evaluate_and_store())
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'results': results,
+                'overall_feedback': overall_feedback
+            }
+        })
+        
+    except Exception as e:
+        logger.exception("Error submitting quiz")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/learner/<learner_id>/progress', methods=['GET'])
+def get_learner_progress(learner_id):
+    try:
+        logger.info("Getting progress for learner: %s", learner_id)
+        
+        # Get learner profile
+        learner_profile = db.learner_profiles.find_one({'id': learner_id}, {'_id': 0})
+        if not learner_profile:
+            return jsonify({'success': False, 'error': 'Learner profile not found'}), 404
+        
+        # Get learning path
+        learning_path = db.learning_paths.find_one({'learner_id': learner_id}, {'_id': 0})
+        if not learning_path:
+            return jsonify({'success': False, 'error': 'Learning path not found'}), 404
+        
+        # Calculate progress metrics
+        total_resources = len(learning_path['resources'])
+        completed_resources = learning_path['current_position']
+        completion_percentage = (completed_resources / total_resources * 100) if total_resources > 0 else 0
+        
+        progress_data = {
+            'learner_profile': learner_profile,
+            'learning_path': {
+                'total_resources': total_resources,
+                'completed_resources': completed_resources,
+                'completion_percentage': completion_percentage,
+                'current_position': learning_path['current_position']
+            },
+            'progress_details': learning_path.get('progress', {})
+        }
+        
+        return jsonify({
+            'success': True,
+            'data': progress_data
+        })
+        
+    except Exception as e:
+        logger.exception("Error getting learner progress")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# Cached dashboard payload; rebuilt at most once per minute
+_analytics_cache = {'expires': 0.0, 'data': None}
+
+@app.route('/api/analytics/dashboard', methods=['GET'])
+def get_analytics_dashboard():
+    try:
+        logger.info("Getting analytics dashboard")
+        
+        # Dashboards tolerate a minute of staleness; serve the cached copy
+        # instead of re-aggregating on every hit
+        if _analytics_cache['data'] is not None and time.time() < _analytics_cache['expires']:
+            return jsonify({
+                'success': True,
+                'analytics': _analytics_cache['data']
+            })
+        
+        # Get total learners
+        total_learners = db.learner_profiles.count_documents({})
+        
+        # Get total quizzes
+        total_quizzes = db.quiz_submissions.count_documents({})
+        
+        # Path count and average completion rate in one server-side
+        # aggregation instead of pulling every path into Python; paths with
+        # no resources contribute None, which $avg ignores, matching the
+        # old loop's behaviour
+        path_stats = next(db.learning_paths.aggregate([
+            {'$project': {'ratio': {'$cond': [
+                {'$gt': [{'$size': '$resources'}, 0]},
+                {'$multiply': [
+                    {'$divide': ['$current_position', {'$size': '$resources'}]}, 100
+                ]},
+                None
+            ]}}},
+            {'$group': {'_id': None, 'avg': {'$avg': '$ratio'}, 'total': {'$sum': 1}}}
+        ]), None)
+        total_paths = path_stats['total'] if path_stats else 0
+        avg_completion = (path_stats.get('avg') or 0) if path_stats else 0
+        
+        # Get learning styles distribution
+        learning_styles = list(db.learner_profiles.aggregate([
+            {'$group': {'_id': '$learning_style', 'count': {'$sum': 1}}}
+        ]))
+        
+        analytics = {
+            'total_learners': total_learners,
+            'total_paths': total_paths,
+            'total_quizzes': total_quizzes,
+            'average_completion_rate': avg_completion,
+            'learning_styles_distribution': learning_styles
+        }
+        
+        _analytics_cache['data'] = analytics
+        _analytics_cache['expires'] = time.time() + 60
+        
+        return jsonify({
+            'success': True,
+            'analytics': analytics
+        })
+        
+    except Exception as e:
+        logger.exception("Error getting analytics")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# Health check. Load balancers poll this every few seconds; without the
+# cache each poll fired a live Gemini generation, burning quota and
+# latency. The probe result is reused for a minute.
+_gemini_health = {'expires': 0.0, 'ok': False}
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    now = time.time()
+    if now >= _gemini_health['expires']:
+        _gemini_health['ok'] = test_gemini_connection()
+        _gemini_health['expires'] = now + 60
+    gemini_status = _gemini_health['ok']
+    return jsonify({
+        'status': 'healthy', 
+        'timestamp': datetime.utcnow().isoformat(),
+        'gemini_connected': gemini_status,
+        'ai_model': 'gemini-2.0-flash-exp',
+        'auth_enabled': False,
+        'public_access': True
+    })
+
+def test_gemini_connection():
+    try:
+        if not GEMINI_API_KEY:
+            logger.error("Gemini API key not configured")
+            return False
+            
+        # Reuse the path agent's client so the probe rides the shared
+        # requests.Session instead of paying a fresh TLS handshake; bypass
+        # the prompt cache so the probe actually reaches the API instead of
+        # replaying the first success forever
+        gemini = orchestrator.path_agent.gemini
+        response = gemini.generate("Test prompt: Say hello", max_tokens=10, use_cache=False)
+        logger.info("Gemini AI connection successful")
+        return True
+    except Exception as e:
+        logger.error("Gemini AI connection failed: %s; make sure your "
+                     "GEMINI_API_KEY is correctly set in .env file", e)
+        return False
+
+def _prewarm_quiz_cache():
+    """Warm the persistent quiz cache for the most-requested subjects
+
+    Pretests always ask for 5 questions at difficulty 2, so generating that
+    exact combination for the historically popular subjects populates
+    LLMCache before the first learner of the day pays the generation
+    latency. Runs on a daemon thread; any failure only means a cold cache.
+    """
+    try:
+        popular = db.pretests.aggregate([
+            {'$group': {'_id': '$subject', 'count': {'$sum': 1}}},
+            {'$sort': {'count': -1}},
+            {'$limit': 3}
+        ])
+        for entry in popular:
+            subject = entry['_id']
+            if not subject:
+                continue
+            run_async(orchestrator.content_agent.generate_quiz_questions(
+                topic=subject, difficulty=2, count=5
+            ))
+            logger.info("Pre-warmed quiz cache for subject: %s", subject)
+    except Exception as e:
+        logger.warning("Quiz cache pre-warm skipped: %s", e)
+
+if __name__ == '__main__':
+    logger.info("Starting Personalized Tutor API (No Authentication)")
+
+    if os.getenv('PREWARM_QUIZ_CACHE', '1') == '1':
+        threading.Thread(target=_prewarm_quiz_cache, name='quiz-prewarm', daemon=True).start()
+    
+    # Test Gemini connection
+    if test_gemini_connection():
+        logger.info("Ready to serve requests!")
+    else:
+        logger.warning("Gemini AI connection issues detected, but server will "
+                       "start anyway; make sure to set GEMINI_API_KEY in your .env file")
+    
+    # debug=True forces the single-threaded reloader dev server; keep it
+    # opt-in and serve requests on threads so one slow LLM call doesn't
+    # serialize every other client
+    debug = os.getenv('FLASK_DEBUG', '0') == '1'
+    app.run(debug=debug, host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file